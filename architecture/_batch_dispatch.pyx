@@ -0,0 +1,42 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+MAOTrade - Dispatch a lotti dei trading systems, percorso caldo compilato
+
+Versione Cython di _process_batch di base_system_framework.py: un solo
+ciclo C aggiorna lo storico barre e chiama do_process_data di tutti i
+systems che condividono lo stesso frame, scrivendo le triple (azione,
+quantità, stop) in un array 2D.
+
+base_system_framework.py la importa se compilata
+(cythonize -3 _batch_dispatch.pyx), altrimenti usa il ciclo Python.
+"""
+
+
+# Valore raw di SystemAction.NOACTION
+cdef int _NOACTION = 0
+
+
+cpdef process_batch(list systems, dict frame, dict portfolio, double[:, :] out):
+    """Valuta ogni system sul frame e scrive la riga i di out (vedi versione Python)"""
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = len(systems)
+    cdef int act
+    if out.shape[0] < n or out.shape[1] < 3:
+        raise ValueError(f"Array risultati {out.shape[0]}x{out.shape[1]} troppo piccolo per {n} systems")
+    time_now = frame['timeNow']
+    for i in range(n):
+        system = systems[i]
+        system._store_bar(frame)
+        action, qty, stop = system._do_process_data_fn(frame, portfolio)
+        act = action
+        if system._completed:
+            act = _NOACTION
+            qty = stop = 0.0
+        out[i, 0] = act
+        out[i, 1] = qty
+        out[i, 2] = stop
+        # Timeout azioni (10 minuti)
+        if (act == _NOACTION and system._system_action != _NOACTION and
+                (time_now - system._params['actionTime']) > 600):
+            system._system_action = _NOACTION
+            system._params['actionTime'] = 0
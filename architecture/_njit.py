@@ -0,0 +1,22 @@
+"""
+MAOTrade - Decoratore njit con fallback
+
+Se numba è installato espone numba.njit, altrimenti un decoratore che
+lascia la funzione invariata: i kernel numerici restano importabili ed
+eseguibili (in Python puro) anche senza numba.
+"""
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op: supporta sia @njit che @njit(cache=True, ...)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
@@ -0,0 +1,46 @@
+"""
+MAOTrade - Kernel di sweep delle scadenze degli ordini
+
+Quando la coda ordini dell'Account Manager va ricostruita per intero
+(ripartenza con ordini ricaricati, compattazione dell'heap) lo stato degli
+ordini viene copiato in colonne NumPy e un kernel compilato da numba
+calcola in un solo passaggio l'istante del prossimo evento di ogni ordine,
+senza un ciclo Python sugli oggetti.
+"""
+
+from _njit import njit
+
+
+# Valori raw di DealStatus.NOT_SUBMITTED e DealStatus.DELAYED: costanti di
+# compilazione per numba, il modulo non importa order_lifecycle_management
+NOT_SUBMITTED = 0
+DELAYED = 1
+
+
+@njit(cache=True)
+def find_due(status, deadline, retry, t, event_time):
+    """
+    Istante del prossimo evento di ogni ordine in attesa, come in
+    OrderQueue._schedule: t per gli ordini da processare subito (nuovi, in
+    retry dovuto o con la deadline di submit scaduta), altrimenti
+    min(retry, deadline + 1).
+
+    Args:
+        status: colonna int64 di dealStatus
+        deadline: colonna int64 di submitDeadline
+        retry: colonna int64 di submitRetry
+        t: timestamp corrente
+        event_time: colonna int64 di uscita, lunga quanto status
+
+    Returns:
+        Numero di ordini da processare subito
+    """
+    n = 0
+    for i in range(status.shape[0]):
+        s = status[i]
+        if s == NOT_SUBMITTED or (s == DELAYED and t >= retry[i]) or deadline[i] < t:
+            event_time[i] = t
+            n += 1
+        else:
+            event_time[i] = min(retry[i], deadline[i] + 1)
+    return n
@@ -0,0 +1,136 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+MAOTrade - Account Manager, percorso caldo compilato
+
+Versione Cython di BaseAccountInfo, BaseOrder e del loop di dispatch
+richieste di account_manager_abstraction.py. Stessa interfaccia delle
+classi Python, ma con attributi tipizzati C: niente __dict__, niente
+boxing di float/int negli accessi dal codice compilato.
+
+account_manager_abstraction.py la importa se compilata
+(cythonize -3 account_fast.pyx), altrimenti usa le classi Python.
+BaseAccountManager resta Python per non toccare l'interfaccia astratta.
+"""
+
+# Valori raw di TradingTime.OPEN e AccountStatus.UNDEFINED: il modulo non
+# importa account_manager_abstraction per evitare import circolari
+cdef int _TRADING_TIME_OPEN = 1
+cdef int _ACCOUNT_STATUS_UNDEFINED = 99
+
+
+cdef class BaseAccountInfo:
+    """Informazioni account standardizzate (vedi versione Python)"""
+
+    cdef public bint api_conn
+    cdef public bint feed_conn
+    cdef public str accountNameId
+    cdef public str accountName
+    cdef public int status
+    cdef public double pnl
+    cdef public double usedMargin
+    cdef public double totalCash
+    cdef public str currency
+    cdef public long lastUpdate
+    cdef public bint updated
+    cdef dict _cached_out
+
+    def __init__(self):
+        self.api_conn = False
+        self.feed_conn = False
+        self.accountNameId = ""
+        self.accountName = ""
+        self.status = _ACCOUNT_STATUS_UNDEFINED
+        self.pnl = 0.0
+        self.usedMargin = 0.0
+        self.totalCash = 0.0
+        self.currency = "EUR"
+        self.lastUpdate = 0
+        self.updated = False
+        self._cached_out = {
+            'connected': False,
+            'feedAvailable': False,
+            'tradingSessionOpen': False,
+            'accountNameId': "",
+            'accountName': "",
+            'status': _ACCOUNT_STATUS_UNDEFINED,
+            'pnl': 0.0,
+            'usedMargin': 0.0,
+            'totalCash': 0.0,
+            'currency': "EUR",
+            'lastUpdate': 0
+        }
+
+    cpdef dict to_dict(self, int trading_session):
+        """Converte in dizionario standard per MAOTrade"""
+        cdef dict out = self._cached_out
+        self.updated = False
+        out['connected'] = self.api_conn
+        out['feedAvailable'] = self.feed_conn
+        out['tradingSessionOpen'] = trading_session == _TRADING_TIME_OPEN
+        out['accountNameId'] = self.accountNameId
+        out['accountName'] = self.accountName
+        out['status'] = self.status
+        out['pnl'] = self.pnl
+        out['usedMargin'] = self.usedMargin
+        out['totalCash'] = self.totalCash
+        out['currency'] = self.currency
+        out['lastUpdate'] = self.lastUpdate
+        return out.copy()
+
+    def update_from(self, pa):
+        """Aggiorna P&L e margine totali dalle posizioni del portfolio"""
+        cdef Py_ssize_t n = pa.count
+        self.pnl = float(pa.pnl[:n].sum())
+        self.usedMargin = float(pa.margin[:n].sum())
+        self.updated = True
+
+
+cdef class BaseOrder:
+    """Rappresentazione ordine standardizzata (vedi versione Python)"""
+
+    cdef public str epic
+    cdef public str epicBroker
+    cdef public double qty
+    cdef public double stopPrice
+    cdef public int orderType
+    cdef public int action
+    cdef public int dealStatus
+    cdef public str errorMessage
+
+    def __init__(self):
+        self.epic = ""
+        self.epicBroker = ""
+        self.qty = 0.0
+        self.stopPrice = 0.0
+        self.orderType = 0
+        self.action = 0
+        self.dealStatus = 0
+        self.errorMessage = ""
+
+    cpdef bint validate_order(self):
+        """Validazione base ordine"""
+        return len(self.epic) > 0 and self.qty > 0.0
+
+
+cpdef bint _validate_order(str epic, double qty):
+    """Stessa validazione di BaseOrder.validate_order su valori semplici"""
+    return len(epic) > 0 and qty > 0.0
+
+
+cpdef list dispatch_requests(list dispatch, list requests):
+    """Loop caldo di dispatch delle richieste del TradeMgr (vedi versione Python)"""
+    cdef list failed = []
+    cdef dict request
+    cdef Py_ssize_t service
+    cdef Py_ssize_t n = len(dispatch)
+    for request in requests:
+        service = request['service']
+        handler = dispatch[service] if 0 <= service < n else None
+        if handler is None:
+            failed.append((request['service'], None))
+            continue
+        try:
+            handler(request['data'])
+        except Exception as e:
+            failed.append((service, e))
+    return failed
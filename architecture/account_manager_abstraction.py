@@ -1,3 +1,4 @@
+# cython: language_level=3
 """
 MAOTrade - Account Manager Pattern
 
@@ -6,13 +7,113 @@ multi-broker. Ogni broker implementa questa interfaccia, permettendo a
 MAOTrade di operare su qualsiasi broker senza modifiche al core.
 
 Questo NON è codice eseguibile, ma una vetrina dell'architettura implementata.
+
+Il modulo è annotato in modo completo e senza feature dinamiche sul percorso
+caldo: nel sistema reale viene compilato AOT con Cython in modalità
+pure-python (cythonize -3 account_manager_abstraction.py), stesso sorgente,
+con le operazioni su int/bool/float dei callback eseguite in C.
 """
 
-from abc import ABC, abstractmethod
-from queue import Queue
-from typing import Dict, Any
+from collections import deque
+from queue import Full, Empty
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Sequence
 from enum import IntEnum
 
+import numpy as np
+
+# faster-fifo: coda su buffer circolare in shared memory con mutex POSIX,
+# molto più veloce di queue.Queue sul percorso caldo broker <-> TradeMgr.
+# Espone le stesse API put/get e le stesse eccezioni Full/Empty di queue.
+try:
+    from faster_fifo import Queue as FFQueue
+    HAS_FASTER_FIFO = True
+except ImportError:
+    from queue import Queue as FFQueue
+    HAS_FASTER_FIFO = False
+
+# Corsie in uscita verso il TradeMgr: ring SPSC lock-free per i tick del feed
+# (boost::lockfree::spsc_queue esposto via pybind11, altrimenti il fallback
+# Python con la stessa interfaccia) e coda MPSC per gli eventi prioritari
+try:
+    from spsc_ring import SPSCRing
+except ImportError:
+    from message_transport import SPSCRing
+from message_transport import MPSCQueue, SharedBarRing, SpillWriter, bar_ring_name
+from order_lifecycle_management import OrderAction, OrderEventKind, OrderQueue, single_order_batch
+
+# Trasporto cross-process verso il TradeMgr: messaggi serializzati con orjson
+# su BytesHyperQ (ring in shared memory con doppia mappatura, niente pickle)
+try:
+    import orjson
+    from hyperq import BytesHyperQ
+    HAS_BYTES_QUEUE = True
+except ImportError:
+    HAS_BYTES_QUEUE = False
+
+# Capacità del ring tick (potenza di due) e numero massimo di tick
+# inoltrati al TradeMgr per iterazione
+TICK_OUT_CAPACITY = 1 << 16
+TICK_DRAIN_BATCH = 256
+
+# Tentativi di push sul ring tick pieno prima di scartare il tick: il
+# thread del feed non resta mai bloccato se il main loop è fermo
+TICK_PUSH_SPINS = 1024
+
+# Barre per ring OHLCV in shared memory (potenza di due, ~1 giornata a 1 minuto)
+BAR_RING_CAPACITY = 1 << 11
+
+# Dimensione del buffer delle code Account Manager <-> TradeMgr
+AM_QUEUE_MAX_SIZE_BYTES = 16 * 1024 * 1024
+
+# Directory (tmpfs) dei lotti di overflow quando la out_queue è piena
+SPILL_DIR = "/dev/shm/maotrade"
+
+
+def create_am_queue(use_bytes_queue: bool = False) -> FFQueue:
+    """
+    Crea una coda di comunicazione tra TradeMgr e Account Manager.
+
+    Usata dal TradeMgr per costruire in_queue/out_queue di ogni account.
+
+    Args:
+        use_bytes_queue: True per la out_queue cross-process su BytesHyperQ,
+            da abbinare al flag di configurazione 'use_bytes_queue'
+    """
+    if use_bytes_queue:
+        if not HAS_BYTES_QUEUE:
+            raise ImportError("use_bytes_queue richiede orjson e hyperq")
+        return BytesHyperQ(AM_QUEUE_MAX_SIZE_BYTES)
+    if HAS_FASTER_FIFO:
+        return FFQueue(max_size_bytes=AM_QUEUE_MAX_SIZE_BYTES)
+    return FFQueue()
+
+
+def decode_message(payload: bytes) -> dict:
+    """
+    Decodifica lato TradeMgr un messaggio ricevuto su out_queue BytesHyperQ.
+    """
+    return orjson.loads(payload)
+
+
+# Servizi richiesti dal TradeMgr all'Account Manager (campo 'service' su in_queue).
+# Numerazione densa: sono indici diretti nella tabella di dispatch
+SERVICE_ID_ACCOUNT_INFO = 1
+SERVICE_ID_PORTFOLIO = 2
+SERVICE_ID_ORDER_OPEN = 3
+SERVICE_ID_ORDER_CLOSE = 4
+SERVICE_ID_MARKET_DATA = 5
+SERVICE_ID_ORDER_STOP = 6
+MAX_SERVICE_ID = SERVICE_ID_ORDER_STOP
+
+# Payload condiviso dei messaggi senza dati: immutabile per convenzione,
+# evita di allocare un dict vuoto ad ogni messaggio
+_EMPTY_DATA = {}
+
+# Finestra in cui le richieste account/portfolio vengono fuse in una sola chiamata
+INFO_COALESCE_WINDOW_SECS = 0.02
+
 
 class AccountStatus(IntEnum):
     """Stati account broker - dal mio sistema reale"""
@@ -30,7 +131,65 @@ class TradingTime(IntEnum):
     TO_CLOSE = 3
 
 
-class BaseAccountManager(ABC):
+# Valori raw usati nei confronti del percorso caldo (int == int invece di IntEnum)
+_TT_OPEN = TradingTime.OPEN.value
+_STATUS_UNDEFINED = AccountStatus.UNDEFINED.value
+
+
+def _ensure_int(status: int | IntEnum) -> int:
+    """Converte AccountStatus (o int) nel valore raw memorizzato"""
+    return int(status)
+
+
+@dataclass(slots=True)
+class _AMState:
+    """
+    Stato gestito da ogni Account Manager.
+
+    Campi piatti con slots al posto dei dict annidati: letto ad ogni tick,
+    ogni accesso è un singolo attributo invece di due lookup.
+    """
+    tradingTime: TradingTime = TradingTime.CLOSE
+    account_valid: bool = False
+    account_requestInfo: bool = False
+    account_nextRequestInfo: int = 0
+    portfolio_valid: bool = False
+    portfolio_requestInfo: bool = False
+    portfolio_nextRequestInfo: int = 0
+
+    def to_dict(self) -> dict:
+        """Formato annidato atteso dal TradeMgr"""
+        return {
+            'tradingTime': self.tradingTime,
+            'account': {
+                'valid': self.account_valid,
+                'requestInfo': self.account_requestInfo,
+                'nextRequestInfo': self.account_nextRequestInfo
+            },
+            'portfolio': {
+                'valid': self.portfolio_valid,
+                'requestInfo': self.portfolio_requestInfo,
+                'nextRequestInfo': self.portfolio_nextRequestInfo
+            }
+        }
+
+
+# Metodi che ogni broker deve implementare, verificati alla definizione della sottoclasse
+_REQUIRED_METHODS = (
+    'account_manager_main',
+    'do_async_request_account_info',
+    'do_async_request_portfolio',
+    'do_async_request_order_open',
+    'do_async_request_order_close',
+    'do_async_request_market_data',
+    'on_account_manager_init',
+    'on_account_manager_terminate',
+    'on_trading_open',
+    'on_trading_close',
+)
+
+
+class BaseAccountManager:
     """
     Classe base astratta per tutti gli Account Manager.
     
@@ -40,8 +199,26 @@ class BaseAccountManager(ABC):
     
     Pattern implementato nel mio sistema reale in produzione.
     """
-    
-    def __init__(self, config: Dict[str, Any], in_queue: Queue, out_queue: Queue):
+
+    # Dict messaggio riutilizzabili: sotto raffiche di tick evitano di
+    # allocare (e far raccogliere al GC) un dict per ogni messaggio
+    _MSG_FREELIST = deque(maxlen=4096)
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        Verifica, una volta sola alla definizione della classe broker, che
+        tutti i metodi obbligatori siano implementati.
+
+        Sostituisce ABC/abstractmethod: niente metaclasse né controllo ad ogni
+        istanziazione, isinstance sul percorso veloce di CPython.
+        """
+        super().__init_subclass__(**kwargs)
+        missing = [name for name in _REQUIRED_METHODS
+                   if getattr(cls, name) is getattr(BaseAccountManager, name)]
+        if missing:
+            raise TypeError(f"{cls.__name__}: metodi non implementati {', '.join(missing)}")
+
+    def __init__(self, config: Dict[str, Any], in_queue: FFQueue, out_queue: FFQueue) -> None:
         """
         Setup base per ogni Account Manager
         
@@ -53,28 +230,55 @@ class BaseAccountManager(ABC):
         self._config = config
         self._in_queue = in_queue
         self._out_queue = out_queue
+        # True se out_queue è una BytesHyperQ (TradeMgr in altro processo):
+        # i messaggi viaggiano serializzati con orjson. False per l'harness
+        # in-process, che usa la coda di oggetti.
+        self._use_bytes_queue = config.get('use_bytes_queue', False)
         self._server_running = False
         self._log = None  # Logger specifico per questo account manager
+
+        # Corsie in uscita svuotate dal main loop verso out_queue: tick del
+        # feed (solo thread feed produttore) ed eventi prioritari (ordini,
+        # sessione) da qualsiasi thread
+        self._tick_out = SPSCRing(TICK_OUT_CAPACITY)
+        self._event_out = MPSCQueue()
+        self._tick_buffer = [None] * TICK_DRAIN_BATCH
+        self._ticks_dropped = 0  # Tick scartati a ring pieno (scritto solo dal thread feed)
+
+        # Overflow su tmpfs se il TradeMgr non tiene il ritmo: il thread
+        # dell'Account Manager non resta mai bloccato sulla out_queue
+        self._spill = SpillWriter(SPILL_DIR, f"spill_{config.get('idAccount', 0)}")
         
         # Stato gestito da ogni implementazione
-        self._state = {
-            'tradingTime': TradingTime.CLOSE,
-            'account': {
-                'valid': False,
-                'requestInfo': False,
-                'nextRequestInfo': 0
-            },
-            'portfolio': {
-                'valid': False,
-                'requestInfo': False,
-                'nextRequestInfo': 0
-            }
-        }
+        self._state = _AMState()
+
+        # Richieste info in attesa di essere fuse ('account', 'portfolio') e
+        # scadenza (time.monotonic) della finestra di coalescenza
+        self._pending_info_requests = set()
+        self._coalesce_deadline = 0.0
+
+        # Ordini richiesti dal TradeMgr: validati e accodati con politica di
+        # submit e retry, inviati al broker da _process_orders()
+        self._order_queue = OrderQueue()
+        self._orders_open = single_order_batch(self.do_async_request_order_open)
+        self._orders_close = single_order_batch(self.do_async_request_order_close)
+        self._orders_stop = single_order_batch(self.do_async_request_order_stop)
+
+        # Tabella di dispatch delle richieste dal TradeMgr, indicizzata per
+        # service id: costruita una volta sola con i metodi già legati
+        # all'istanza (override del broker compresi), nel loop caldo ogni
+        # messaggio costa un accesso a lista + una chiamata. I broker
+        # valorizzano i loro servizi dopo super().__init__()
+        self._request_dispatch = [None] * (MAX_SERVICE_ID + 1)
+        self._request_dispatch[SERVICE_ID_ACCOUNT_INFO] = self._on_request_account_info
+        self._request_dispatch[SERVICE_ID_PORTFOLIO] = self._on_request_portfolio
+        self._request_dispatch[SERVICE_ID_ORDER_OPEN] = self._on_request_order_open
+        self._request_dispatch[SERVICE_ID_ORDER_CLOSE] = self._on_request_order_close
+        self._request_dispatch[SERVICE_ID_MARKET_DATA] = self.do_async_request_market_data
 
     # === METODI CHE OGNI BROKER DEVE IMPLEMENTARE ===
 
-    @abstractmethod
-    def account_manager_main(self, time_now: int):
+    def account_manager_main(self, time_now: int) -> None:
         """
         Main loop chiamato ad ogni iterazione.
         
@@ -89,8 +293,7 @@ class BaseAccountManager(ABC):
         """
         pass
 
-    @abstractmethod
-    def do_async_request_account_info(self):
+    def do_async_request_account_info(self) -> None:
         """
         Richiede informazioni account al broker.
         
@@ -101,8 +304,7 @@ class BaseAccountManager(ABC):
         """
         pass
 
-    @abstractmethod
-    def do_async_request_portfolio(self):
+    def do_async_request_portfolio(self) -> None:
         """
         Richiede posizioni aperte al broker.
         
@@ -110,8 +312,7 @@ class BaseAccountManager(ABC):
         """
         pass
 
-    @abstractmethod
-    def do_async_request_order_open(self, order: 'BaseOrder'):
+    def do_async_request_order_open(self, order: 'BaseOrder') -> None:
         """
         Esegue apertura posizione.
         
@@ -120,8 +321,7 @@ class BaseAccountManager(ABC):
         """
         pass
 
-    @abstractmethod
-    def do_async_request_order_close(self, order: 'BaseOrder'):
+    def do_async_request_order_close(self, order: 'BaseOrder') -> None:
         """
         Esegue chiusura posizione.
         
@@ -130,7 +330,16 @@ class BaseAccountManager(ABC):
         """
         pass
 
-    @abstractmethod
+    def do_async_request_order_stop(self, order: 'BaseOrder') -> None:
+        """
+        Modifica lo stop di una posizione aperta. Opzionale: i broker che non
+        lo supportano rifiutano l'ordine.
+
+        Args:
+            order: Oggetto ordine con dealReference e nuovo stopPrice
+        """
+        order.set_rejected("ERRORE modifica stop non supportata dal broker")
+
     def do_async_request_market_data(self, request: dict) -> bool:
         """
         Gestisce sottoscrizioni dati real-time.
@@ -150,8 +359,7 @@ class BaseAccountManager(ABC):
 
     # === LIFECYCLE METHODS ===
 
-    @abstractmethod
-    def on_account_manager_init(self):
+    def on_account_manager_init(self) -> tuple:
         """
         Inizializzazione Account Manager.
         
@@ -166,38 +374,266 @@ class BaseAccountManager(ABC):
         """
         pass
 
-    @abstractmethod
-    def on_account_manager_terminate(self):
+    def on_account_manager_terminate(self) -> None:
         """Cleanup alla terminazione"""
         pass
 
-    @abstractmethod
-    def on_trading_open(self, time_now: int):
+    def on_trading_open(self, time_now: int) -> None:
         """Chiamata quando si apre una sessione di trading"""
         pass
 
-    @abstractmethod
-    def on_trading_close(self, time_now: int):
+    def on_trading_close(self, time_now: int) -> None:
         """Chiamata quando si chiude una sessione di trading"""
         pass
 
     # === UTILITY METHODS (già implementati nel sistema base) ===
 
-    def _send_message(self, service_id: int, data: dict = None, service_code: int = 0):
+    def _send_message(self, service_id: int, data: Optional[dict] = None,
+                      service_code: int = 0) -> None:
         """
         Invia messaggio al core MAOTrade.
         
         Ogni Account Manager usa questo per comunicare stati,
         dati di mercato, risultati ordini al TradeMgr.
+
+        Il messaggio viene accodato nella corsia giusta: i dati di mercato
+        (solo dal thread del feed) nel ring tick, tutto il resto negli eventi
+        prioritari. L'invio effettivo avviene in _flush_out_messages().
         """
-        message = {
-            'service': service_id,
-            'srvCode': service_code,
-            'data': data or {}
-        }
-        self._out_queue.put(message)
+        try:
+            message = self._MSG_FREELIST.pop()
+        except IndexError:
+            message = {}
+        message['service'] = service_id
+        message['srvCode'] = service_code
+        message['data'] = data if data is not None else _EMPTY_DATA
+        if service_id == SERVICE_ID_MARKET_DATA:
+            # Ring pieno: attesa limitata che il main loop lo svuoti, poi il
+            # tick viene scartato (il successivo lo supera) e contato
+            push = self._tick_out.push
+            for _ in range(TICK_PUSH_SPINS):
+                if push(message):
+                    return
+            self._ticks_dropped += 1
+            self._MSG_FREELIST.append(message)
+        else:
+            self._event_out.put(message)
+
+    def _flush_out_messages(self) -> None:
+        """
+        Inoltra al TradeMgr gli eventi accodati e poi fino a TICK_DRAIN_BATCH tick.
+
+        Da chiamare ad ogni iterazione di account_manager_main: gli eventi
+        prioritari non restano mai dietro l'arretrato di tick.
+        """
+        batch = self._event_out.drain()
+        n = self._tick_out.pop_many(self._tick_buffer, TICK_DRAIN_BATCH)
+        if n:
+            batch.extend(self._tick_buffer[:n])
+        if batch:
+            self._put_batch(batch)
+        self._spill.maybe_close_batch()
+
+    def _send_messages(self, messages: list) -> None:
+        """
+        Invia un lotto di messaggi al core MAOTrade con un solo put.
+
+        Sotto raffiche di tick o refresh portfolio evita un lock (e una
+        serializzazione) per ogni messaggio.
+
+        Args:
+            messages: lista di tuple (service_id, data, service_code)
+        """
+        self._put_batch([
+            {'service': service_id, 'srvCode': service_code, 'data': data or {}}
+            for service_id, data, service_code in messages
+        ])
+
+    def _put_batch(self, batch: list) -> None:
+        """
+        Scrive un lotto di messaggi già costruiti su out_queue.
+
+        Non blocca mai: se la coda è piena (o c'è già un lotto di overflow
+        aperto, per non invertire l'ordine dei messaggi) il resto del lotto
+        va nello spill su tmpfs, letto dal TradeMgr con SpillReader.
+
+        Con faster-fifo e BytesHyperQ i messaggi vengono serializzati nella
+        coda, quindi i dict tornano subito nella freelist. Con la coda di
+        oggetti in-process li restituisce il consumatore con recycle_message().
+        """
+        sent = 0
+        if not self._spill.active:
+            try:
+                if self._use_bytes_queue:
+                    for message in batch:
+                        self._out_queue.put(orjson.dumps(message))
+                        sent += 1
+                elif HAS_FASTER_FIFO:
+                    self._out_queue.put_many(batch, block=False)
+                    sent = len(batch)
+                else:
+                    for message in batch:
+                        self._out_queue.put_nowait(message)
+                        sent += 1
+            except Full:
+                pass
+        if sent < len(batch):
+            self._spill.add(batch[sent:])
 
-    def response_async_account_info(self, error: str = ""):
+        if self._use_bytes_queue or HAS_FASTER_FIFO:
+            self._MSG_FREELIST.extend(batch)
+        else:
+            self._MSG_FREELIST.extend(batch[sent:])
+
+    @staticmethod
+    def recycle_message(message: dict) -> None:
+        """
+        Restituisce alla freelist un messaggio già elaborato.
+
+        Lato consumatore, solo con la coda di oggetti in-process e solo
+        quando non si tiene più nessun riferimento al messaggio.
+        """
+        BaseAccountManager._MSG_FREELIST.append(message)
+
+    def _drain_requests(self, max_requests: int = 64) -> Sequence[dict]:
+        """
+        Preleva dalla in_queue fino a max_requests richieste del TradeMgr.
+
+        Da chiamare in account_manager_main al posto di un get() per iterazione:
+        un solo lock per tutto il lotto. Tra un evento di mercato e l'altro la
+        coda è quasi sempre vuota: con faster-fifo qsize() legge il contatore
+        in shared memory senza lock, così il caso comune non tocca il mutex.
+
+        Returns:
+            Richieste prelevate, sequenza vuota se la coda è vuota
+        """
+        if HAS_FASTER_FIFO:
+            if self._in_queue.qsize() == 0:
+                return ()
+            try:
+                return self._in_queue.get_many_nowait(max_messages_to_get=max_requests)
+            except Empty:
+                return ()
+
+        requests = []
+        try:
+            while len(requests) < max_requests:
+                requests.append(self._in_queue.get_nowait())
+        except Empty:
+            pass
+        return requests
+
+    def _dispatch_requests(self, requests: list) -> None:
+        """
+        Smista un lotto di richieste ai metodi do_async_request_* del broker.
+
+        Un handler che solleva eccezione non blocca il resto del lotto:
+        l'errore viene solo registrato.
+        """
+        for service, error in dispatch_requests(self._request_dispatch, requests):
+            if error is None:
+                self._log.warning(f"Servizio richiesto non gestito: {service}")
+            else:
+                self._log.error(f"Errore nel servizio {service}: {error!r}")
+
+    def _on_request_order_open(self, data: dict) -> None:
+        """Richiesta apertura posizione dal TradeMgr"""
+        self._enqueue_order(SERVICE_ID_ORDER_OPEN, OrderAction.OPEN_POSITION, data)
+
+    def _on_request_order_close(self, data: dict) -> None:
+        """Richiesta chiusura posizione dal TradeMgr"""
+        self._enqueue_order(SERVICE_ID_ORDER_CLOSE, OrderAction.CLOSE_POSITION, data)
+
+    def _on_request_order_stop(self, data: dict) -> None:
+        """Richiesta modifica stop dal TradeMgr (broker con SERVICE_ID_ORDER_STOP)"""
+        self._enqueue_order(SERVICE_ID_ORDER_STOP, OrderAction.MODIFY_POSITION, data)
+
+    def _enqueue_order(self, service_id: int, action: OrderAction, data: dict) -> None:
+        """
+        Costruisce il BaseOrder dalla richiesta, lo valida e lo accoda in
+        _order_queue. Un ordine non valido non entra in coda: il rifiuto
+        torna subito al TradeMgr con srvCode di errore.
+
+        L'ordine parte dal timestamp dell'ultimo tick processato dalla coda,
+        nessuna lettura dell'orologio.
+        """
+        queue = self._order_queue
+        order = queue.new_order()
+        order.init_order(data['orderId'], action, data['epic'],
+                         data.get('currency', ""), data.get('qty', 0.0),
+                         direction=data.get('direction', 0),
+                         order_type=data.get('orderType', 0),
+                         stop_price=data.get('stopPrice', 0.0),
+                         max_submit_time_sec=data.get('maxSubmitTimeSec', 120),
+                         submit_time_delay_sec=data.get('submitDelayTimeSec', 30),
+                         time_now=queue.time_now,
+                         epic_broker=data.get('epicBroker', ""))
+        if not order.validate_order():
+            self._send_message(service_id, {'orderId': order.orderId,
+                                            'message': order.errorMessage},
+                               service_code=1)
+            return
+        queue.add(order)
+
+    def _process_orders(self, time_now: int) -> int:
+        """
+        Invia al broker gli ordini dovuti e ritenta quelli in DELAYED.
+        Da chiamare ad ogni iterazione di account_manager_main, dopo il
+        dispatch delle richieste.
+
+        Returns:
+            int: Ordini eliminati dalla coda
+        """
+        return self._order_queue.process_order_list(time_now, self._orders_open,
+                                                    self._orders_close, self._orders_stop)
+
+    def _on_request_account_info(self, data: dict) -> None:
+        """Richiesta info account dal TradeMgr, fusa con eventuale richiesta portfolio"""
+        self._add_info_request('account')
+
+    def _on_request_portfolio(self, data: dict) -> None:
+        """Richiesta portfolio dal TradeMgr, fusa con eventuale richiesta account"""
+        self._add_info_request('portfolio')
+
+    def _add_info_request(self, resource: str) -> None:
+        """Accoda la richiesta e apre la finestra di coalescenza se non già aperta"""
+        if not self._pending_info_requests:
+            self._coalesce_deadline = time.monotonic() + INFO_COALESCE_WINDOW_SECS
+        self._pending_info_requests.add(resource)
+
+    def _flush_info_requests(self) -> None:
+        """
+        Invia al broker le richieste info accumulate, scaduta la finestra.
+
+        Da chiamare ad ogni iterazione di account_manager_main: più strategie che
+        chiedono account e portfolio nello stesso tick generano una sola chiamata.
+        """
+        if not self._pending_info_requests or time.monotonic() < self._coalesce_deadline:
+            return
+        account = 'account' in self._pending_info_requests
+        portfolio = 'portfolio' in self._pending_info_requests
+        self._pending_info_requests.clear()
+
+        if account:
+            self._state.account_requestInfo = True
+        if portfolio:
+            self._state.portfolio_requestInfo = True
+        self.do_async_request_account_bundle(account, portfolio)
+
+    def do_async_request_account_bundle(self, account: bool, portfolio: bool) -> None:
+        """
+        Richiede al broker account e/o portfolio.
+
+        Di default due chiamate separate; i broker con un endpoint unico
+        (es. IG /accounts) lo sovrascrivono con una sola chiamata e rispondono
+        con response_async_account_bundle().
+        """
+        if account:
+            self.do_async_request_account_info()
+        if portfolio:
+            self.do_async_request_portfolio()
+
+    def response_async_account_info(self, error: str = "") -> None:
         """
         Callback per risposta info account.
         
@@ -205,12 +641,12 @@ class BaseAccountManager(ABC):
         """
         if error:
             self._log.error(f"Richiesta account fallita: {error}")
-            self._state['account']['valid'] = False
+            self._state.account_valid = False
         else:
             self._log.debug("Richiesta info account OK")
-            self._state['account']['requestInfo'] = False
+            self._state.account_requestInfo = False
 
-    def response_async_portfolio(self, error: str = ""):
+    def response_async_portfolio(self, error: str = "") -> None:
         """
         Callback per risposta portfolio.
         
@@ -218,10 +654,20 @@ class BaseAccountManager(ABC):
         """
         if error:
             self._log.error(f"Richiesta portfolio fallita: {error}")
-            self._state['portfolio']['valid'] = False
+            self._state.portfolio_valid = False
         else:
             self._log.debug("Richiesta portfolio OK")
-            self._state['portfolio']['requestInfo'] = False
+            self._state.portfolio_requestInfo = False
+
+    def response_async_account_bundle(self, error: str = "") -> None:
+        """
+        Callback per risposta fusa account + portfolio.
+
+        Da chiamare dopo una do_async_request_account_bundle() servita con
+        una sola chiamata al broker.
+        """
+        self.response_async_account_info(error)
+        self.response_async_portfolio(error)
 
 
 class BaseAccountInfo:
@@ -231,13 +677,17 @@ class BaseAccountInfo:
     Ogni broker popola questa struttura con i suoi dati specifici,
     ma MAOTrade vede sempre la stessa interfaccia.
     """
-    
-    def __init__(self):
+
+    __slots__ = ('api_conn', 'feed_conn', 'accountNameId', 'accountName', '_status',
+                 'pnl', 'usedMargin', 'totalCash', 'currency', 'lastUpdate',
+                 'updated', '_cached_out')
+
+    def __init__(self) -> None:
         self.api_conn = False           # Connessione API
         self.feed_conn = False          # Connessione feed dati
         self.accountNameId = ""         # ID account
         self.accountName = ""           # Nome account
-        self.status = AccountStatus.UNDEFINED
+        self._status = _STATUS_UNDEFINED  # AccountStatus come int raw
         self.pnl = 0.0                  # P&L totale
         self.usedMargin = 0.0           # Margine utilizzato
         self.totalCash = 0.0            # Cash disponibile
@@ -245,27 +695,121 @@ class BaseAccountInfo:
         self.lastUpdate = 0             # Timestamp ultimo aggiornamento
         self.updated = False            # Flag aggiornamento
 
-    def to_dict(self, trading_session: TradingTime) -> dict:
+        # Template di output costruito una volta sola, to_dict lo aggiorna
+        # sul posto e ne restituisce una copia
+        self._cached_out = {
+            'connected': False,
+            'feedAvailable': False,
+            'tradingSessionOpen': False,
+            'accountNameId': "",
+            'accountName': "",
+            'status': _STATUS_UNDEFINED,
+            'pnl': 0.0,
+            'usedMargin': 0.0,
+            'totalCash': 0.0,
+            'currency': "EUR",
+            'lastUpdate': 0
+        }
+
+    @property
+    def status(self) -> int:
+        """Stato account (valore raw di AccountStatus)"""
+        return self._status
+
+    @status.setter
+    def status(self, status: AccountStatus) -> None:
+        self._status = _ensure_int(status)
+
+    def to_dict(self, trading_session: int) -> dict:
         """
         Converte in dizionario standard per MAOTrade.
+
+        Args:
+            trading_session: TradingTime, anche come int raw
         
         Returns:
             Dizionario con formato standard che TradeMgr si aspetta
         """
         self.updated = False
-        return {
-            'connected': self.api_conn,
-            'feedAvailable': self.feed_conn,
-            'tradingSessionOpen': trading_session == TradingTime.OPEN,
-            'accountNameId': self.accountNameId,
-            'accountName': self.accountName,
-            'status': self.status.value,
-            'pnl': self.pnl,
-            'usedMargin': self.usedMargin,
-            'totalCash': self.totalCash,
-            'currency': self.currency,
-            'lastUpdate': self.lastUpdate
-        }
+        out = self._cached_out
+        out['connected'] = self.api_conn
+        out['feedAvailable'] = self.feed_conn
+        out['tradingSessionOpen'] = trading_session == _TT_OPEN
+        out['accountNameId'] = self.accountNameId
+        out['accountName'] = self.accountName
+        out['status'] = self._status
+        out['pnl'] = self.pnl
+        out['usedMargin'] = self.usedMargin
+        out['totalCash'] = self.totalCash
+        out['currency'] = self.currency
+        out['lastUpdate'] = self.lastUpdate
+        return out.copy()
+
+    def update_from(self, pa: 'PortfolioArrays') -> None:
+        """
+        Aggiorna P&L e margine totali dalle posizioni del portfolio.
+
+        Una somma NumPy su array contigui al posto di un loop Python
+        sulle posizioni.
+        """
+        n = pa.count
+        self.pnl = float(pa.pnl[:n].sum())
+        self.usedMargin = float(pa.margin[:n].sum())
+        self.updated = True
+
+
+class PortfolioArrays:
+    """
+    Posizioni del portfolio in array NumPy paralleli (una riga per posizione).
+
+    Le prime `count` righe sono valide.
+    """
+
+    __slots__ = ('qty', 'price', 'pnl', 'margin', 'count')
+
+    def __init__(self, n: int) -> None:
+        self.qty = np.zeros(n)          # Quantità (negativa se short)
+        self.price = np.zeros(n)        # Prezzo medio di carico
+        self.pnl = np.zeros(n)          # P&L posizione
+        self.margin = np.zeros(n)       # Margine utilizzato
+        self.count = 0                  # Posizioni valide
+
+
+class BasePortfolioInfo(PortfolioArrays):
+    """
+    Portfolio standardizzato.
+
+    Ogni broker, alla risposta di do_async_request_portfolio, azzera con
+    clear() e aggiunge le posizioni con add_position(); BaseAccountInfo
+    ricava i totali con update_from().
+    """
+
+    __slots__ = ('epics', 'updated')
+
+    def __init__(self, max_positions: int = 64) -> None:
+        super().__init__(max_positions)
+        self.epics = []                 # Epic MAOTrade per riga
+        self.updated = False            # Flag aggiornamento
+
+    def clear(self) -> None:
+        """Svuota il portfolio prima di un nuovo aggiornamento dal broker"""
+        self.count = 0
+        self.epics.clear()
+
+    def add_position(self, epic: str, qty: float, price: float, pnl: float, margin: float) -> None:
+        """Aggiunge una posizione, raddoppiando gli array se pieni"""
+        row = self.count
+        if row == self.qty.shape[0]:
+            for name in ('qty', 'price', 'pnl', 'margin'):
+                arr = getattr(self, name)
+                setattr(self, name, np.concatenate((arr, np.zeros_like(arr))))
+        self.qty[row] = qty
+        self.price[row] = price
+        self.pnl[row] = pnl
+        self.margin[row] = margin
+        self.epics.append(epic)
+        self.count = row + 1
+        self.updated = True
 
 
 class BaseOrder:
@@ -276,7 +820,7 @@ class BaseOrder:
     nella sua rappresentazione specifica.
     """
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.epic = ""              # Epic MAOTrade
         self.epicBroker = ""        # Epic specifico broker
         self.qty = 0.0              # Quantità
@@ -288,11 +832,80 @@ class BaseOrder:
         
     def validate_order(self) -> bool:
         """Validazione base ordine"""
-        return self.epic != "" and self.qty > 0
+        return bool(self.epic) and self.qty > 0.0
+
+
+def _validate_order(epic: str, qty: float) -> bool:
+    """
+    Stessa validazione di BaseOrder.validate_order su valori semplici.
+
+    Usata nei backtest per validare milioni di ordini sintetici senza
+    accessi ad attributi (compilabile/inlineabile da Numba o Cython).
+    """
+    return bool(epic) and qty > 0.0
+
+
+def dispatch_requests(dispatch: list, requests: list) -> list:
+    """
+    Loop caldo di dispatch delle richieste del TradeMgr.
+
+    Args:
+        dispatch: handler indicizzati per service id (None se non gestito)
+        requests: richieste prelevate dalla in_queue
+
+    Returns:
+        Coppie (service, errore) delle richieste fallite, normalmente lista
+        vuota: errore None se il servizio non ha handler nella tabella,
+        altrimenti l'eccezione sollevata dall'handler. Un handler che fallisce
+        non interrompe il lotto.
+    """
+    failed = []
+    n = len(dispatch)
+    for request in requests:
+        service = request['service']
+        # Service id negativo o oltre la tabella: non gestito (un indice
+        # negativo pescherebbe un handler dalla fine della lista)
+        handler = dispatch[service] if 0 <= service < n else None
+        if handler is None:
+            failed.append((service, None))
+            continue
+        try:
+            handler(request['data'])
+        except Exception as e:
+            failed.append((service, e))
+    return failed
+
+
+# Versioni compilate (Cython, account_fast.pyx) delle classi e del loop di
+# dispatch sul percorso caldo. Se l'estensione non è compilata restano le
+# implementazioni Python qui sopra, con la stessa interfaccia.
+try:
+    from account_fast import BaseAccountInfo, BaseOrder, _validate_order, dispatch_requests
+except ImportError:
+    pass
 
 
 # === ESEMPIO IMPLEMENTAZIONE BROKER SPECIFICO ===
 
+# Sorgente della funzione BaseOrder -> payload REST IG. I parametri fissi del
+# broker (valuta, expiry, forceOpen) vengono scritti come costanti alla init,
+# così nel percorso caldo resta un solo corpo di funzione senza lookup config.
+_IG_ORDER_TO_WIRE_SRC = """
+def order_to_wire(o):
+    return {{
+        'epic': o.epicBroker,
+        'expiry': {expiry!r},
+        'direction': 'BUY' if o.qty > 0 else 'SELL',
+        'size': abs(o.qty),
+        'orderType': 'MARKET',
+        'stopLevel': o.stopPrice or None,
+        'currencyCode': {currency!r},
+        'forceOpen': {force_open!r},
+        'guaranteedStop': False,
+    }}
+"""
+
+
 class IGAccountManagerExample(BaseAccountManager):
     """
     Esempio di implementazione per IG Trading.
@@ -304,14 +917,27 @@ class IGAccountManagerExample(BaseAccountManager):
     - Retry logic e error handling
     """
     
-    def __init__(self, config: dict, in_queue: Queue, out_queue: Queue):
+    def __init__(self, config: dict, in_queue: FFQueue, out_queue: FFQueue) -> None:
         super().__init__(config, in_queue, out_queue)
         # Nel sistema reale:
         # self._client = IGClient(config)
         # self._lsclient = None
-        pass
+
+        # Conversione BaseOrder -> payload IG, generata in on_account_manager_init
+        self._order_to_wire = None
+
+        # Ring OHLCV in shared memory per sottoscrizione (epic, timeFrame).
+        # I ring delle sottoscrizioni cancellate restano aperti in
+        # _retired_bar_rings finché il feed non è fermo: il thread del feed
+        # potrebbe essere ancora dentro una write(). Vengono riusati se la
+        # sottoscrizione torna, chiusi in on_account_manager_terminate
+        self._bar_rings = None
+        self._retired_bar_rings = None
+
+        # Servizi IG-specifici nella tabella di dispatch
+        self._request_dispatch[SERVICE_ID_ORDER_STOP] = self._on_request_order_stop
     
-    def account_manager_main(self, time_now: int):
+    def account_manager_main(self, time_now: int) -> None:
         """
         Main loop specifico per IG Trading.
         
@@ -322,46 +948,140 @@ class IGAccountManagerExample(BaseAccountManager):
         # 2. Connessione LightStreamer per feed
         # 3. Processing messaggi asincroni
         # 4. Health check e retry logic
-        pass
+
+        # Richieste dal TradeMgr: un solo prelievo per tutto il lotto
+        requests = self._drain_requests()
+        if requests:
+            self._dispatch_requests(requests)
+
+        # Ordini dovuti (nuovi e retry) inviati al broker
+        self._process_orders(time_now)
+
+        # Richieste account/portfolio fuse in una sola chiamata REST
+        self._flush_info_requests()
+
+        # Eventi delle callback REST e tick LightStreamer: prima gli eventi,
+        # poi un lotto di tick, con un solo put
+        self._flush_out_messages()
     
-    def do_async_request_order_open(self, order: BaseOrder):
+    def _on_price_update(self, tick: dict) -> None:
+        """
+        Callback LightStreamer, eseguita nel thread del feed.
+
+        Unico produttore del ring tick: il main loop lo svuota ad ogni iterazione.
+        """
+        self._send_message(SERVICE_ID_MARKET_DATA, tick)
+
+    def _on_bar_update(self, epic: str, time_frame: int, bar: dict) -> None:
+        """
+        Callback LightStreamer per le candele, eseguita nel thread del feed.
+
+        La barra viene copiata nel ring in shared memory della sottoscrizione:
+        il TradeMgr la legge come vista NumPy, senza passare dalla coda.
+        """
+        ring = self._bar_rings.get((epic, time_frame))
+        if ring is not None:
+            ring.write(bar['frame'], bar['open'], bar['high'], bar['low'],
+                       bar['close'], bar['vol'])
+
+    def do_async_request_order_open(self, order: BaseOrder) -> None:
         """
         Implementazione IG-specifica per apertura ordini.
         
         Nel sistema reale:
-        1. Richiedo market details per l'epic
-        2. Creo OTC position request 
-        3. Invio al broker via REST API
-        4. Gestisco response asincrona
-        """
-        # Esempio del pattern che uso:
-        # self._client.request_market_details(
-        #     epic=order.epicBroker,
-        #     response_callback=self._handle_order_response,
-        #     response_data={'order': order}
-        # )
-        pass
+        1. Creo OTC position request con la funzione specializzata
+        2. Invio al broker via REST API
+        3. Gestisco response asincrona
+        """
+        self._rest_request('open_position', self._order_to_wire(order), order)
     
-    def do_async_request_portfolio(self):
+    def do_async_request_order_close(self, order: BaseOrder) -> None:
+        """IG-specific: chiusura posizione con ordine di direzione opposta"""
+        self._rest_request('close_position', self._order_to_wire(order), order)
+
+    def do_async_request_order_stop(self, order: BaseOrder) -> None:
+        """IG-specific: modifica stop di una posizione aperta"""
+        self._rest_request('update_position',
+                           {'dealId': order.dealReference, 'stopLevel': order.stopPrice},
+                           order)
+
+    def _rest_request(self, operation: str, payload: dict, order: BaseOrder) -> None:
+        """
+        Invio asincrono della richiesta REST al broker, esito in
+        _handle_order_response sul thread del client.
+
+        Nel reale:
+        self._client.request(
+            operation, payload,
+            response_callback=self._handle_order_response,
+            response_data={'orderId': order.orderId}
+        )
+        """
+        pass
+
+    def _handle_order_response(self, response: dict, data: dict) -> None:
+        """
+        Callback REST di IGClient, eseguita nel thread del client.
+
+        Non modifica l'ordine: pubblica l'esito con post_event e il main loop
+        lo applica all'inizio del prossimo process_order_list, dal solo
+        thread dell'Account Manager.
+        """
+        error = response.get('error')
+        if error:
+            self._order_queue.post_event(OrderEventKind.REJECTED, data['orderId'],
+                                         error['message'])
+        else:
+            self._order_queue.post_event(OrderEventKind.SUBMITTED, data['orderId'],
+                                         response['json']['dealReference'])
+
+    def do_async_request_portfolio(self) -> None:
         """IG-specific portfolio request"""
         # Nel reale: self._client.request_positions(response_callback=self._handle_positions)
         pass
     
-    def do_async_request_account_info(self):
+    def do_async_request_account_info(self) -> None:
         """IG-specific account info request"""  
         # Nel reale: self._client.request_account_info(response_callback=self._handle_account)
         pass
+
+    def do_async_request_account_bundle(self, account: bool, portfolio: bool) -> None:
+        """IG-specific: /accounts restituisce account e posizioni in una sola chiamata"""
+        # Nel reale: self._client.request_account_bundle(
+        #     response_callback=self._handle_account_bundle,
+        #     response_data={'account': account, 'portfolio': portfolio}
+        # )
+        pass
     
     def do_async_request_market_data(self, request: dict) -> bool:
-        """IG-specific market data subscription"""
+        """
+        IG-specific market data subscription.
+
+        Ad ogni sottoscrizione creo il ring OHLCV in shared memory; il TradeMgr
+        lo apre con lo stesso nome (bar_ring_name).
+        """
+        key = (request['epic'], request['timeFrame'])
         if request['subscribe']:
+            if key not in self._bar_rings:
+                ring = self._retired_bar_rings.pop(key, None)
+                if ring is None:
+                    ring = SharedBarRing(
+                        BAR_RING_CAPACITY,
+                        bar_ring_name(self._config.get('idAccount', 0), *key)
+                    )
+                self._bar_rings[key] = ring
             # Nel reale: self._lsclient.subscribe_price_data(...)
             return True
         else:
+            # Prima fermo il feed della sottoscrizione, poi ritiro il ring
+            # senza chiuderlo: una callback già in corso può ancora scriverci
             # Nel reale: self._lsclient.unsubscribe_price_data(...)
+            ring = self._bar_rings.pop(key, None)
+            if ring is not None:
+                self._retired_bar_rings[key] = ring
             return True
     
-    def on_account_manager_init(self):
+    def on_account_manager_init(self) -> tuple:
         """
         Setup timeframes supportati da IG.
         
@@ -371,20 +1091,37 @@ class IGAccountManagerExample(BaseAccountManager):
         # Mapping timeframes IG -> MAOTrade (dal mio sistema reale)
         history_frames = {1: "MINUTE", 5: "MINUTE_5", 60: "HOUR", -1: "DAY"}
         data_frames = {300: "5MINUTE", 60: "1MINUTE", 1: "SECOND"}
+
+        # Specializzo la conversione ordini sulla configurazione dell'account
+        fn_src = _IG_ORDER_TO_WIRE_SRC.format(
+            currency=self._config.get('currency', "EUR"),
+            expiry=self._config.get('expiry', "-"),
+            force_open=bool(self._config.get('forceOpen', True))
+        )
+        namespace = {}
+        exec(compile(fn_src, '<ig_order_to_wire>', 'exec'), namespace)
+        self._order_to_wire = namespace['order_to_wire']
+
+        self._bar_rings = {}
+        self._retired_bar_rings = {}
         
-        return True, BaseAccountInfo(), None, BaseOrder(), history_frames, data_frames
+        return True, BaseAccountInfo(), BasePortfolioInfo(), BaseOrder(), history_frames, data_frames
     
-    def on_account_manager_terminate(self):
+    def on_account_manager_terminate(self) -> None:
         """Cleanup IG connections"""
         # Nel reale: self._client.terminate(), self._disconnect_feed()
-        pass
+        # Feed fermo: nessuna callback può più scrivere sui ring
+        for rings in (self._bar_rings, self._retired_bar_rings):
+            for ring in rings.values():
+                ring.close()
+            rings.clear()
     
-    def on_trading_open(self, time_now: int):
+    def on_trading_open(self, time_now: int) -> None:
         """IG-specific trading open logic"""
         # Nel reale: rinnovo token API, reset connessioni
         pass
     
-    def on_trading_close(self, time_now: int):  
+    def on_trading_close(self, time_now: int) -> None:
         """IG-specific trading close logic"""
         # Nel reale: disconnect feed, cleanup
         pass
@@ -0,0 +1,195 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+MAOTrade - BaseOrder dell'Account Manager, percorso caldo compilato
+
+Versione Cython di BaseOrder di order_lifecycle_management.py: stessa
+interfaccia, attributi tipizzati C e stati/azioni come int al posto delle
+IntEnum (che restano ai confini dell'API: confronti e lookup per valore
+funzionano uguale). I messaggi di errore vengono costruiti solo nei rami
+di rifiuto.
+
+order_lifecycle_management.py la importa se compilata
+(cythonize -3 --inline base_order.pyx), altrimenti usa la classe Python.
+"""
+
+# Valori raw di OrderAction e DealStatus: il modulo non importa
+# order_lifecycle_management per evitare import circolari
+cdef int _OPEN_POSITION = 0
+cdef int _NOT_SUBMITTED = 0
+cdef int _DELAYED = 1
+cdef int _SUBMITTING = 2
+cdef int _SUBMITTED = 3
+cdef int _EXECUTING = 4
+cdef int _REJECTED = 5
+cdef int _TOTRASH = 6
+
+# Eventi della state machine (stessi valori di order_lifecycle_management)
+cdef int EV_SEND = 0
+cdef int EV_SEND_STOP = 1
+cdef int EV_SUBMIT = 2
+cdef int EV_DELAY = 3
+cdef int EV_REJECT = 4
+cdef int EV_TRASH = 5
+
+cdef unsigned char _ILLEGAL = 0xFF
+
+
+cdef bytes _build_transitions():
+    """Tabella (stato << 4) | evento -> nuovo stato, vedi versione Python"""
+    pending = {EV_SEND: _SUBMITTING, EV_SEND_STOP: _EXECUTING, EV_DELAY: _DELAYED,
+               EV_REJECT: _REJECTED, EV_TRASH: _TOTRASH}
+    in_flight = {EV_SUBMIT: _SUBMITTED, EV_DELAY: _DELAYED, EV_REJECT: _REJECTED,
+                 EV_TRASH: _TOTRASH}
+    legal = {
+        _NOT_SUBMITTED: pending,
+        _DELAYED: pending,
+        _SUBMITTING: in_flight,
+        _EXECUTING: in_flight,
+        _SUBMITTED: {EV_SUBMIT: _SUBMITTED, EV_REJECT: _REJECTED, EV_TRASH: _TOTRASH},
+        _REJECTED: {EV_REJECT: _REJECTED, EV_TRASH: _TOTRASH},
+    }
+    table = bytearray([_ILLEGAL]) * ((_TOTRASH + 1) << 4)
+    for state, moves in legal.items():
+        for event, new_state in moves.items():
+            table[(state << 4) | event] = new_state
+    return bytes(table)
+
+
+cdef bytes _TRANSITIONS = _build_transitions()
+cdef const unsigned char* _TABLE = _TRANSITIONS
+
+# Messaggio di rifiuto precalcolato
+cdef str _QTY_ZERO_ERROR = "ERRORE quantità zero non ammessa su nuove posizioni"
+
+
+cdef class BaseOrder:
+    """Ordine nell'Account Manager (vedi versione Python)"""
+
+    # Identificatori
+    cdef public long orderId
+    cdef public str epic
+    cdef public str epicBroker
+
+    # Parametri ordine
+    cdef public int action
+    cdef public str currency
+    cdef public double qty
+    cdef public int direction
+    cdef public int orderType
+    cdef public double stopPrice
+
+    # Stato processing
+    cdef public int dealStatus
+    cdef public str dealReference
+    cdef public str errorMessage
+
+    # Timing e retry logic
+    cdef public long submitStart
+    cdef public long submitDeadline
+    cdef public long submitDelay
+    cdef public long submitRetry
+
+    def __init__(self):
+        self.orderId = 0
+        self.epic = ""
+        self.epicBroker = ""
+        self.action = _OPEN_POSITION
+        self.currency = ""
+        self.qty = 0.0
+        self.direction = 0
+        self.orderType = 0
+        self.stopPrice = 0.0
+        self.dealStatus = _NOT_SUBMITTED
+        self.dealReference = ""
+        self.errorMessage = ""
+        self.submitStart = 0
+        self.submitDeadline = 0
+        self.submitDelay = 30
+        self.submitRetry = 0
+
+    cpdef init_order(self, long order_id, int action, str epic,
+                     str currency, double qty, int direction=0,
+                     int order_type=0, double stop_price=0.0,
+                     long max_submit_time_sec=120,
+                     long submit_time_delay_sec=30,
+                     long time_now=0, str epic_broker=""):
+        """Inizializza l'ordine con i parametri specificati"""
+        self.orderId = order_id
+        self.action = action
+        self.epic = epic
+        self.epicBroker = epic_broker
+        self.currency = currency
+        self.qty = qty
+        self.direction = direction
+        self.orderType = order_type
+        self.stopPrice = stop_price
+        self.dealReference = ""
+        self.submitStart = time_now
+        self.submitDeadline = time_now + max_submit_time_sec
+        self.errorMessage = ""
+        self.dealStatus = _NOT_SUBMITTED
+        self.submitDelay = submit_time_delay_sec
+        self.submitRetry = 0
+
+    cpdef bint validate_order(self):
+        """Valida i dati dell'ordine prima dell'invio"""
+        if not self.epicBroker:
+            self.errorMessage = "ERRORE Epic " + self.epic + " non trovato lato broker"
+            self.transition(EV_REJECT)
+            return False
+
+        # Validazione specifica per nuove posizioni
+        if self.action == _OPEN_POSITION:
+            if self.direction != 1 and self.direction != 2:
+                self.errorMessage = f"ERRORE direzione {self.direction}. Valori ammessi sono 1 o 2"
+                self.transition(EV_REJECT)
+                return False
+
+            if self.qty == 0:
+                self.errorMessage = _QTY_ZERO_ERROR
+                self.transition(EV_REJECT)
+                return False
+
+            # Ordine long: quantità positiva, ordine short: quantità negativa
+            if (self.direction == 1 and self.qty < 0) or (self.direction == 2 and self.qty > 0):
+                self.qty = -self.qty
+
+        return True
+
+    @property
+    def deal_status(self):
+        """Stato processing come DealStatus, per il codice fuori dal percorso caldo"""
+        from order_lifecycle_management import DealStatus
+        return DealStatus(self.dealStatus)
+
+    cpdef bint transition(self, int event):
+        """Avanza dealStatus secondo la tabella delle transizioni"""
+        cdef unsigned char new_status = _TABLE[(self.dealStatus << 4) | event]
+        if new_status == _ILLEGAL:
+            return False
+        self.dealStatus = new_status
+        return True
+
+    cpdef bint set_delayed(self, long time_now, str error_msg=""):
+        """Mette l'ordine in stato DELAYED per retry successivo"""
+        if not self.transition(EV_DELAY):
+            return False
+        if error_msg:
+            self.errorMessage = error_msg
+        self.submitRetry = time_now + self.submitDelay
+        return True
+
+    cpdef bint set_rejected(self, str error_msg):
+        """Mette l'ordine in stato REJECTED con messaggio errore"""
+        if not self.transition(EV_REJECT):
+            return False
+        self.errorMessage = error_msg
+        return True
+
+    cpdef bint set_submitted(self, str deal_reference=""):
+        """Mette l'ordine in stato SUBMITTED dopo invio al broker"""
+        if not self.transition(EV_SUBMIT):
+            return False
+        if deal_reference:
+            self.dealReference = deal_reference
+        return True
@@ -9,8 +9,20 @@ Questo NON è codice eseguibile, ma una vetrina del framework implementato.
 """
 
 from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, astuple, fields
 from enum import IntEnum
-from typing import Dict, Any, Tuple, List
+from functools import lru_cache, partial
+import logging
+from operator import itemgetter
+from typing import TYPE_CHECKING, Dict, Any, Tuple, List
+
+import numpy as np
+
+# Solo per le annotazioni dei callback ordini: a runtime il framework non
+# dipende dal modulo del TradeMgr
+if TYPE_CHECKING:
+    from order_lifecycle_management import TradeOrder
 
 
 class SystemAction(IntEnum):
@@ -66,6 +78,208 @@ class Severity(IntEnum):
     CRITICAL = 4
 
 
+# === COSTANTI INTERE PER I PERCORSI CALDI ===
+# Gemelle plain-int degli IntEnum, usate da process_data, _execute_action e
+# dai callback ordini: confronti tra int e nomi per indice, senza Enum.
+# Gli IntEnum restano l'API esposta ai systems utente.
+
+class _SA:
+    """SystemAction come interi"""
+    NOACTION = 0
+    ACTION_DELAY = 1
+    ACTION_PREBUY = 2
+    ACTION_BUY = 3
+    ACTION_PRESELL = 4
+    ACTION_SELL = 5
+    ACTION_BUYLOST = 6
+    ACTION_SELLLOST = 7
+    ACTION_BUYSELL = 8
+    ACTION_HOLD = 9
+    ACTION_FLAT = 10
+    ACTION_STPR = 11
+
+
+class _OES:
+    """OrderExecState come interi"""
+    JUST_CREATED = 0
+    SUBMITTED = 1
+    ACCEPTED = 2
+    FILLED = 3
+    ERROR = 4
+    CANCELLED = 5
+
+
+class _OOT:
+    """OrderOpType come interi"""
+    NO_OP = 0
+    BUY = 1
+    SELL = 2
+
+
+class _OAT:
+    """OrderAuthorType come interi"""
+    AUTHOR_SYSTEM = 0
+    AUTHOR_RESTART = 1
+    AUTHOR_USER = 2
+    AUTHOR_UNDEFINED = 99
+
+
+class _SEV:
+    """Severity come interi"""
+    DEBUG = 0
+    INFO = 1
+    WARNING = 2
+    ERROR = 3
+    CRITICAL = 4
+
+
+# Nomi indicizzati per valore, per i log (valori contigui da 0)
+_SA_NAMES = tuple(member.name for member in SystemAction)
+_OES_NAMES = tuple(member.name for member in OrderExecState)
+_OOT_NAMES = tuple(member.name for member in OrderOpType)
+
+# Azioni del percorso per-tick come globali di modulo
+_NOACTION = _SA.NOACTION
+_ACTION_BUY = _SA.ACTION_BUY
+_ACTION_SELL = _SA.ACTION_SELL
+_ACTION_FLAT = _SA.ACTION_FLAT
+
+
+# Livello logging corrispondente ad ogni Severity, indicizzato per valore
+_LOG_LEVELS = (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL)
+
+
+# === SCHEMA PARAMETRI SYSTEM ===
+
+def _is_signal_str(value) -> bool:
+    """Valore ammesso per il parametro signal"""
+    return value in ('BUY', 'SELL', 'FLAT', 'HOLD')
+
+
+def _compile_param_extractor(schema: tuple):
+    """
+    Genera, una volta per classe, la funzione che estrae e valida i parametri
+    di uno schema fisso: un lookup srotolato per chiave, senza cicli né
+    confronti sui nomi a runtime.
+
+    Args:
+        schema: Tupla di (chiave, obbligatorio, validatore o None)
+
+    Returns:
+        Funzione (system_params) -> (valori, "") se OK, (None, chiave) al primo
+        parametro mancante o non valido
+    """
+    lines = ["def _extract_params(sp):"]
+    namespace = {}
+    for i, (key, required, validator) in enumerate(schema):
+        lines.append(f"    p = sp.get({key!r})")
+        lines.append(f"    v{i} = p.get('value') if p else None")
+        check = f"v{i} is None" if required else "False"
+        if validator is not None:
+            namespace[f"_check{i}"] = validator
+            check += f" or (v{i} is not None and not _check{i}(v{i}))"
+        if check != "False":
+            lines.append(f"    if {check}:")
+            lines.append(f"        return None, {key!r}")
+    values = "".join(f"v{i}, " for i in range(len(schema)))
+    lines.append(f"    return ({values}), ''")
+    exec("\n".join(lines), namespace)
+    return namespace['_extract_params']
+
+
+@lru_cache(maxsize=256)
+def _parse_params_cached(items: tuple) -> tuple:
+    """
+    Parametri utente ordinati per chiave, con i valori così come arrivano
+    dal segnale. Funzione pura memoizzata sulla tupla (chiave, valore):
+    systems reinizializzati con gli stessi parametri non rifanno il lavoro.
+
+    Args:
+        items: Tupla di (chiave, valore); con valori non hashable (liste,
+            dict) il chiamante usa _parse_params senza cache
+
+    Returns:
+        Tupla di (chiave, valore) ordinata per chiave
+    """
+    return _parse_params(items)
+
+
+def _parse_params(items: tuple) -> tuple:
+    """Versione non memoizzata di _parse_params_cached"""
+    return tuple(sorted(items, key=itemgetter(0)))
+
+
+# Campi obbligatori del segnale letti da initialize_system in un solo accesso C
+# (idOp è opzionale e resta un signal.get)
+_SIGNAL_GETTER = itemgetter('dateOp', 'startTrade', 'endTrade', 'completed',
+                            'blocked', 'operate', 'systemUserParams')
+
+
+# Posizione assente dal portfolio: condivisa, da non modificare
+_EMPTY_POSITION = {'qty': 0.0, 'avgPrice': 0.0}
+
+
+# Default condiviso dei callback ordini, da non modificare: evita una tupla
+# nuova ad ogni evento quando l'ordine non ha azione on_filled
+_NO_FILLED_ACTION = (_NOACTION, 0.0, 0.0)
+
+
+# Storico barre del system: array strutturato a layout fisso invece di lista di dict
+_BAR_DTYPE = np.dtype([('ts', 'i8'), ('o', 'f8'), ('h', 'f8'), ('l', 'f8'),
+                       ('c', 'f8'), ('v', 'f8')])
+MAX_BARS = 1 << 11  # Una giornata di barre a 1 minuto con margine
+
+
+def bars_from_frames(frame_data: List[dict]) -> np.ndarray:
+    """Converte una lista di frame (dict) nell'array strutturato delle barre"""
+    bars = np.empty(len(frame_data), dtype=_BAR_DTYPE)
+    for i, f in enumerate(frame_data):
+        bars[i] = (f['frame'], f['open'], f['high'], f['low'], f['close'], f['vol'])
+    return bars
+
+
+def _process_batch(systems: list, frame: dict, portfolio: dict, out: np.ndarray):
+    """
+    Valuta tutti i systems sullo stesso frame: riga i di out = (azione,
+    quantità, stop) ritornati da do_process_data del system i.
+
+    Come process_data: ogni system aggiorna il suo storico barre e la
+    strategia gira sempre, i systems completati lasciano la riga a NOACTION
+    e l'ultima azione scade dopo 10 minuti senza nuove azioni.
+    """
+    if out.shape[0] < len(systems) or out.shape[1] < 3:
+        raise ValueError(f"Array risultati {out.shape[0]}x{out.shape[1]} troppo piccolo "
+                         f"per {len(systems)} systems")
+    time_now = frame['timeNow']
+    for i, system in enumerate(systems):
+        system._store_bar(frame)
+        action, qty, stop = system._do_process_data_fn(frame, portfolio)
+        act = int(action)
+        if system._completed:
+            act = _NOACTION
+            qty = stop = 0.0
+        out[i, 0] = act
+        out[i, 1] = qty
+        out[i, 2] = stop
+        # Timeout azioni (10 minuti)
+        if (act == _NOACTION and system._system_action != _NOACTION and
+                (time_now - system._params['actionTime']) > 600):
+            system._system_action = _NOACTION
+            system._params['actionTime'] = 0
+
+
+# Versione compilata (Cython, _batch_dispatch.pyx) del ciclo di dispatch a
+# lotti; se l'estensione non è compilata resta il ciclo Python qui sopra
+try:
+    from _batch_dispatch import process_batch as _process_batch
+except ImportError:
+    pass
+
+
+# Massimo numero di richieste ordine in attesa di essere prelevate dal Gateway
+ORDER_REQUESTS_MAX_LEN = 256
+
+
 class BaseSystem(ABC):
     """
     Classe base astratta per tutti i trading systems.
@@ -80,14 +294,40 @@ class BaseSystem(ABC):
     
     Ogni sistema implementa solo la logica specifica.
     """
-    
+
+    # Niente __dict__ per istanza: molti systems attivi insieme, attributi a
+    # slot fisso. Le sottoclassi dichiarano i propri __slots__
+    __slots__ = ('_state', '_state_updated', '_params', '_system_params', '_config',
+                 'epic', 'time_frame', 'blocked', '_completed', '_error', '_system_action', 'system_signal',
+                 '_order_requests', '_order_template', 'max_order_submit_time_in_secs',
+                 'order_submit_time_delay_in_secs', 'frame_miss_updates_in_secs',
+                 '_portfolio', '_position_qty', '_epic_idx', '_action_handlers', '_bars', '_bar_count',
+                 '_logger', '_log_dispatch',
+                 '_do_process_data_fn', '_do_initialize_system_fn', '_do_resume_system_fn')
+
+    # Tipo dello stato del system: dict generico, o una dataclass a slot
+    # dichiarata dalla sottoclasse (vedi FUTMState)
+    STATE_CLASS = dict
+
+    # Slot di runtime della sottoclasse da includere nel checkpoint
+    # (__getstate__/__setstate__), in aggiunta ai campi del framework
+    PERSISTENT_SLOTS = ()
+
+    # Parametri utente del system: tupla di (chiave, obbligatorio, validatore).
+    # Ogni sottoclasse ha il suo estrattore compilato in _extract_params
+    PARAM_SCHEMA = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._extract_params = staticmethod(_compile_param_extractor(cls.PARAM_SCHEMA))
+
     def __init__(self, config: Dict[str, Any]):
         """
         Setup base per ogni trading system.
         Nel sistema reale viene chiamato _do_init() invece di __init__.
         """
         # Stato del sistema - tutto quello che metto qui viene salvato automaticamente
-        self._state = {}
+        self._state = self.STATE_CLASS()
         self._state_updated = False
         
         # Parametri di configurazione
@@ -99,20 +339,50 @@ class BaseSystem(ABC):
         self.epic = config.get('epic', '')
         self.time_frame = config.get('timeFrame', 0)
         
-        # Controllo esecuzione
+        # Controllo esecuzione. _completed/_error rispecchiano systemCompleted e
+        # systemError di _params (fonte per la persistenza) per le letture per-tick
         self.blocked = False
-        self.system_action = SystemAction.NOACTION
+        self._completed = False
+        self._error = False
+        self._system_action = _NOACTION  # Intero, esposto come SystemAction dalla property
         self.system_signal = ""
         
-        # Gestione ordini
-        self._order_requests = []
+        # Gestione ordini: coda FIFO limitata, il Gateway preleva con pop_order_request
+        self._order_requests = deque(maxlen=ORDER_REQUESTS_MAX_LEN)
+        self._order_template = self._build_order_template()
         # Se l'ordine non viene inviato al broker entro 2 minuti viene annullato l'invio
         self.max_order_submit_time_in_secs = 120
         # Intervallo di attesa tra un tentativo ed il successivo per invio ordine a broker
         self.order_submit_time_delay_in_secs = 30
+        # Tempo massimo senza aggiornamenti del frame, ridefinito in initialize_system
+        self.frame_miss_updates_in_secs = self.time_frame * 3
         
+        # Storico barre: buffer preallocato, le prime _bar_count righe valide
+        self._bars = np.empty(MAX_BARS, dtype=_BAR_DTYPE)
+        self._bar_count = 0
+
+        # Portfolio corrente: stesso oggetto ad ogni chiamata, memorizzato in
+        # initialize_system così process_data può non riceverlo
+        self._portfolio = {}
+
+        # Quantità posizioni in formato SoA: vista float64 mantenuta dal
+        # portfolio manager, una cella per epic (vedi bind_position_qty)
+        self._position_qty = None
+        self._epic_idx = 0
+
+        # Handler delle azioni già legati all'istanza, indicizzati per azione
+        self._action_handlers = {action: partial(handler.__get__(self), *args)
+                                 for action, (handler, args) in self._ACTION_HANDLERS.items()}
+
+        # Implementazioni del system già risolte e legate all'istanza: il
+        # framework le chiama senza rifare il lookup sulla MRO ad ogni tick
+        self._do_process_data_fn = self.do_process_data
+        self._do_initialize_system_fn = self.do_initialize_system
+        self._do_resume_system_fn = self.do_resume_system
+
         # Logging
-        self._log = None  # Logger del sistema
+        self._logger = None  # Logger del sistema (vedi set_logger)
+        self._log_dispatch = ()  # Metodi del logger indicizzati per Severity
         
     # === METODI CHE OGNI SISTEMA DEVE IMPLEMENTARE ===
     
@@ -214,7 +484,7 @@ class BaseSystem(ABC):
         pass
     
     @abstractmethod
-    def do_resume_system(self, frame_data: List[dict], portfolio: dict, 
+    def do_resume_system(self, bars: np.ndarray, portfolio: dict, 
                         chart: Any, state: dict, log: list, 
                         time_now: int, import_uid: str) -> bool:
         """
@@ -224,7 +494,8 @@ class BaseSystem(ABC):
         deve ricostruire lo stato interno dai dati salvati.
         
         Args:
-            frame_data: Lista frame processati nella giornata
+            bars: Barre della giornata, array strutturato con campi
+                ts/o/h/l/c/v (es. bars['c'] sono le chiusure)
             portfolio: Portfolio corrente
             chart: Dati grafico (se disponibili)
             state: Stato salvato prima del crash
@@ -240,17 +511,58 @@ class BaseSystem(ABC):
             if state:
                 self._state.update(state)
                 
-            # Ricalcolo indicatori da dati storici
-            for frame in frame_data:
-                self._update_indicators(frame)
+            # Ricalcolo indicatori da dati storici, a colonne: per EMA/ATR/VWAP
+            # c'è il kernel compilato _resume_numba.replay_frames
+            ema, atr, vwap, missing = replay_frames(bars['o'], bars['h'], bars['l'],
+                                                    bars['c'], bars['v'], bars['ts'],
+                                                    self.time_frame)
                 
             return True
         """
         pass
 
     # === UTILITY METHODS (già implementati nel framework) ===
+
+    def resume_system(self, frame_data: List[dict], portfolio: dict,
+                      chart: Any, state: dict, log: list,
+                      time_now: int, import_uid: str) -> bool:
+        """
+        Entry point della ripresa: carica i frame della giornata nello storico
+        barre e chiama do_resume_system() con l'array delle barre.
+        """
+        bars = bars_from_frames(frame_data[-MAX_BARS:])
+        n = len(bars)
+        self._bars[:n] = bars
+        self._bar_count = n
+        ret = self._do_resume_system_fn(self.bars, portfolio, chart, state, log,
+                                        time_now, import_uid)
+        self._sync_status_flags()
+        return ret
+
+    @property
+    def bars(self) -> np.ndarray:
+        """Vista sulle barre valide dello storico, dalla più vecchia"""
+        return self._bars[:self._bar_count]
+
+    def _store_bar(self, frame_data: dict):
+        """
+        Aggiorna lo storico barre col frame corrente: sovrascrive l'ultima
+        barra se è dello stesso timeframe, altrimenti ne aggiunge una nuova.
+        A buffer pieno scarta la metà più vecchia.
+        """
+        ts = frame_data['frame']
+        n = self._bar_count
+        if not n or self._bars[n - 1]['ts'] != ts:
+            if n == MAX_BARS:
+                half = MAX_BARS // 2
+                self._bars[:half] = self._bars[half:]
+                n = half
+            n += 1
+            self._bar_count = n
+        self._bars[n - 1] = (ts, frame_data['open'], frame_data['high'], frame_data['low'],
+                             frame_data['close'], frame_data['vol'])
     
-    def process_data(self, frame_data: dict, portfolio: dict):
+    def process_data(self, frame_data: dict, portfolio: dict = None):
         """
         Wrapper che gestisce il ciclo completo di elaborazione.
         
@@ -261,82 +573,138 @@ class BaseSystem(ABC):
         4. Controlla stati di errore/blocco
         5. Gestisce timeout azioni
         6. Salva stato se modificato
+
+        Se portfolio non è passato usa quello memorizzato in initialize_system.
         """
-        # Normalizzazione timestamp
+        if portfolio is None:
+            portfolio = self._portfolio
+
+        # Normalizzazione timestamp e aggiornamento storico barre
         frame_data['frame'] -= frame_data['frame'] % self.time_frame
-        position = portfolio.get(self._params['epic'], dict())
-        time_now = frame_data['timeNow']
+        self._store_bar(frame_data)
 
-        # Chiamo la logica del sistema
-        action, action_qty, action_stop = self.do_process_data(frame_data, portfolio)
+        # Chiamo la logica del sistema: sempre, anche con ordine in corso o
+        # system completato, così la strategia aggiorna il suo stato su ogni frame
+        action, action_qty, action_stop = self._do_process_data_fn(frame_data, portfolio)
+        act = int(action)
 
         # Se il sistema è completato, non processo
         if self.is_completed():
-            action = SystemAction.NOACTION
+            act = _NOACTION
 
         # Se c'è un ordine in corso, aspetto
         if frame_data['orderSubmitting']:
             return
 
-        # Controllo stati di blocco/errore
-        if action != SystemAction.NOACTION and (self.blocked or self.is_error_state()):
+        if act != _NOACTION:
+            # Controllo stati di blocco/errore
             if self.blocked:
                 self.consoleLog("Ordine saltato per system bloccato", Severity.WARNING)
-            elif self.is_error_state():
+                return
+            if self.is_error_state():
                 self.consoleLog("Ordine saltato per system in errore", Severity.WARNING)
-            return
+                return
 
-        # Memorizzo ultima azione
-        if action != SystemAction.NOACTION:
-            self.system_action = action
+            # Memorizzo ultima azione
+            self._system_action = act
             self._params['actionTime'] = frame_data['timeNow']
-            
+
+            # Esecuzione azioni
+            if self._position_qty is not None:
+                pos_qty = float(self._position_qty[self._epic_idx])
+            else:
+                pos_qty = (portfolio.get(self.epic) or _EMPTY_POSITION)['qty']
+            self._execute_action(act, action_qty, action_stop, pos_qty)
+
         # Timeout azioni (10 minuti)
-        elif (self.system_action != SystemAction.NOACTION and 
+        elif (self._system_action != _NOACTION and
               (frame_data['timeNow'] - self._params['actionTime']) > 600):
-            self.system_action = SystemAction.NOACTION
+            self._system_action = _NOACTION
             self._params['actionTime'] = 0
 
-        # Esecuzione azioni
-        self._execute_action(action, action_qty, action_stop, position)
+    @classmethod
+    def process_batch(cls, systems: list, frame_data: dict, portfolio: dict) -> np.ndarray:
+        """
+        Valuta in un solo ciclo tutti i systems sottoscritti allo stesso
+        epic/timeframe, invece di una chiamata process_data per system.
+
+        Storico barre, system completato e timeout dell'azione come in
+        process_data; gli altri controlli (ordine in corso, blocco, errore)
+        restano a carico del Gateway, che scorre l'array risultato per creare
+        gli ordini a lotti. Tutti i systems devono avere lo stesso timeframe.
+
+        Returns:
+            Array float64 (len(systems), 3) con righe (azione, quantità, stop)
+        """
+        out = np.zeros((len(systems), 3))
+        if systems:
+            time_frame = systems[0].time_frame
+            if any(system.time_frame != time_frame for system in systems):
+                raise ValueError("process_batch: systems con timeframe diversi nello stesso lotto")
+            frame_data['frame'] -= frame_data['frame'] % time_frame
+            _process_batch(systems, frame_data, portfolio, out)
+        return out
+
+    @property
+    def system_action(self) -> SystemAction:
+        """Ultima azione del sistema, memorizzata internamente come intero"""
+        return SystemAction(self._system_action)
+
+    @system_action.setter
+    def system_action(self, action: SystemAction):
+        self._system_action = int(action)
+
+    def bind_position_qty(self, qty_array: np.ndarray, epic_idx: int):
+        """
+        Collega il system all'array delle quantità del portfolio manager.
+        Da qui in poi process_data legge la posizione con un solo accesso
+        indicizzato invece dei lookup sul dict del portfolio.
+
+        Args:
+            qty_array: Array float64 delle quantità, una cella per epic
+            epic_idx: Indice dell'epic del system nell'array
+        """
+        self._position_qty = qty_array
+        self._epic_idx = epic_idx
 
-    def _execute_action(self, action: SystemAction, action_qty: float, 
-                       action_stop: float, position: dict):
+    def _execute_action(self, action: int, action_qty: float, 
+                       action_stop: float, pos_qty: float):
         """
         Esegue l'azione richiesta dal sistema.
         
         Dal mio codice reale - gestisce BUY, SELL, FLAT con logica specifica.
+        Salto diretto all'handler dell'azione tramite la tabella per istanza.
         """
-        if action == SystemAction.ACTION_FLAT and position.get('qty', 0.0):
-            # Chiusura posizione
-            delta_pos = abs(position.get('qty', 0.0)) - action_qty
-            adj_qty = max(0.0, delta_pos)
-            if adj_qty:
-                self.consoleLog(f"FLAT: Chiudo posizioni: {adj_qty}", Severity.INFO)
-                self.close_position(adj_qty)
-            else:
-                self.consoleLog("FLAT: Chiudo tutte le posizioni", Severity.INFO)
-                self.close_position()
-                
-        elif action == SystemAction.ACTION_BUY:
-            # Apertura posizione long
-            if position.get('qty', 0.0) >= 0.0:
-                self.consoleLog(f"BUY: Apro posizioni: {action_qty}", Severity.INFO)
-                self.open_position(OrderOpType.BUY, action_qty, stop_price=action_stop)
-            else:
-                # Chiudo short e apro long
-                self.consoleLog("BUY(1/2): Chiudo tutte le posizioni", Severity.INFO)
-                self.close_position(on_filled_action=(action, action_qty, action_stop))
-                
-        elif action == SystemAction.ACTION_SELL:
-            # Apertura posizione short
-            if position.get('qty', 0.0) <= 0.0:
-                self.consoleLog(f"SELL: Apro posizioni: {action_qty}", Severity.INFO)
-                self.open_position(OrderOpType.SELL, action_qty, stop_price=action_stop)
-            else:
-                # Chiudo long e apro short
-                self.consoleLog("SELL(1/2): Chiudo tutte le posizioni", Severity.INFO)
-                self.close_position(on_filled_action=(action, action_qty, action_stop))
+        handler = self._action_handlers.get(action)
+        if handler:
+            handler(action_qty, action_stop, pos_qty)
+
+    def _handle_flat(self, action_qty: float, action_stop: float, pos_qty: float):
+        """Chiusura posizione"""
+        if not pos_qty:
+            return
+        delta_pos = abs(pos_qty) - action_qty
+        adj_qty = max(0.0, delta_pos)
+        if adj_qty:
+            self.info_log("FLAT: Chiudo posizioni: %s", adj_qty)
+            self.close_position(adj_qty)
+        else:
+            self.info_log("FLAT: Chiudo tutte le posizioni")
+            self.close_position()
+
+    def _open_or_flip(self, action: int, op_type: OrderOpType, sign: float,
+                      action_qty: float, action_stop: float, pos_qty: float):
+        """
+        Apertura posizione long (sign=+1) o short (sign=-1): apre se la
+        posizione è flat o già nel verso richiesto, altrimenti chiude e rimanda
+        l'apertura all'esecuzione della chiusura (girata posizione).
+        """
+        if pos_qty * sign >= 0.0:
+            self.info_log("%s: Apro posizioni: %s", _OOT_NAMES[op_type], action_qty)
+            self.open_position(op_type, action_qty, stop_price=action_stop)
+        else:
+            self.info_log("%s(1/2): Chiudo tutte le posizioni", _OOT_NAMES[op_type])
+            self.close_position(on_filled_action=(action, action_qty, action_stop))
 
     def initialize_system(self, signal: dict, portfolio: dict, 
                          import_uid: str, is_first_init: bool) -> bool:
@@ -350,28 +718,37 @@ class BaseSystem(ABC):
         - Logging risultati
         - Aggiornamento stati interni
         """
+        (date_op, trade_start, trade_end, completed,
+         blocked, operate, user_params) = _SIGNAL_GETTER(signal)
+
         if is_first_init:
             # Setup parametri di default
             self.max_order_submit_time_in_secs = 120
             self.frame_miss_updates_in_secs = self.time_frame * 3
             self._params['opId'] = signal.get('idOp', 0)
-            self._params['dateOp'] = signal['dateOp']
-            self._params['tradeStart'] = signal['startTrade']
-            self._params['tradeEnd'] = signal['endTrade']
+            self._params['dateOp'] = date_op
+            self._params['tradeStart'] = trade_start
+            self._params['tradeEnd'] = trade_end
 
         # Stati del sistema
-        self._params['systemCompleted'] = signal['completed']
-        self.blocked = signal['blocked']
-        self._params['systemError'] = not signal['operate']
-        
+        self._params['systemCompleted'] = self._completed = bool(completed)
+        self.blocked = blocked
+        self._params['systemError'] = self._error = not operate
+
+        # Riferimento al portfolio per process_data
+        self._portfolio = portfolio
+
         # Pulisco ordini pendenti
         self._order_requests.clear()
+        self._order_template = self._build_order_template()
         
         # Estraggo parametri del sistema
-        self._state['params'] = self._getsystem_params(signal['systemUserParams'])
+        self._system_params = self._getsystem_params(user_params)
+        if isinstance(self._state, dict):
+            self._state['params'] = self._system_params
         
         # Chiamo inizializzazione specifica
-        ret_init = self.do_initialize_system(portfolio, import_uid, is_first_init)
+        ret_init = self._do_initialize_system_fn(portfolio, import_uid, is_first_init)
         
         if ret_init:
             self.consoleLog("Inizializzazione system OK", Severity.INFO, import_uid)
@@ -383,6 +760,21 @@ class BaseSystem(ABC):
         return ret_init
 
     # === UTILITY METHODS PER I SISTEMI ===
+
+    def _getsystem_params(self, user_params: dict) -> dict:
+        """
+        Estrae i parametri utente del system nella struttura {chiave: {'value': v}}.
+        Memoizzata in _parse_params_cached quando i valori sono hashable; il dict ritornato è
+        sempre nuovo, quindi il system può modificarlo liberamente.
+        """
+        items = tuple((key, param.get('value'))
+                      for key, param in user_params.items() if param)
+        try:
+            parsed = _parse_params_cached(items)
+        except TypeError:
+            # Valori non hashable: niente cache
+            parsed = _parse_params(items)
+        return {key: {'value': value} for key, value in parsed}
     
     def get_system_param(self, system_params: dict, key: str):
         """
@@ -390,9 +782,8 @@ class BaseSystem(ABC):
         
         Dal mio codice reale - gestisce la struttura parametri MAOTrade.
         """
-        return (system_params[key]['value'] 
-                if system_params.get(key) and system_params[key].get('value') is not None 
-                else None)
+        param = system_params.get(key)
+        return param.get('value') if param else None
 
     def check_system_param(self, system_params: dict, key: str, 
                           error_msg_missing: str = "", 
@@ -411,13 +802,8 @@ class BaseSystem(ABC):
         Returns:
             True se parametro OK, False altrimenti
         """
-        if not system_params.get(key):
-            if error_msg_missing:
-                self.consoleLog(error_msg_missing, Severity.ERROR, import_uid)
-            return False
-            
-        value = system_params[key].get('value')
-        if value is None:
+        param = system_params.get(key)
+        if not param or param.get('value') is None:
             if error_msg_missing:
                 self.consoleLog(error_msg_missing, Severity.ERROR, import_uid)
             return False
@@ -425,6 +811,36 @@ class BaseSystem(ABC):
         # Ulteriori validazioni possono essere aggiunte qui
         return True
 
+    def set_logger(self, logger: logging.Logger):
+        """
+        Imposta il logger del sistema e precalcola la tabella dei suoi metodi,
+        così consoleLog non rifà la catena di if sulla severità ad ogni chiamata.
+        """
+        self._logger = logger
+        self._log_dispatch = ((logger.debug, logger.info, logger.warning,
+                               logger.error, logger.critical) if logger else ())
+
+    @property
+    def _log(self) -> logging.Logger:
+        """Logger del sistema"""
+        return self._logger
+
+    @_log.setter
+    def _log(self, logger: logging.Logger):
+        # Anche l'assegnazione diretta ricostruisce la tabella dei metodi
+        self.set_logger(logger)
+
+    def info_log(self, message: str, *args):
+        """
+        Log INFO per i percorsi per-tick: se INFO è disattivo non costruisce
+        nessuna stringa, altrimenti la formattazione % è lasciata al logging.
+        Il livello è controllato ad ogni chiamata (isEnabledFor usa la cache
+        del logger), così una riconfigurazione ha effetto subito.
+        """
+        log = self._logger
+        if log and log.isEnabledFor(logging.INFO):
+            log.info("[%s] " + message, self.epic, *args)
+
     def consoleLog(self, message: str, severity: Severity, import_uid: str = ""):
         """
         Logging strutturato per il sistema.
@@ -435,43 +851,83 @@ class BaseSystem(ABC):
         - Epic
         - Timestamp
         - Import UID per tracciabilità
+
+        Se il livello è filtrato esce subito; altrimenti la formattazione è
+        lasciata al modulo logging (stile %), fatta solo se il record viene emesso.
         """
-        if self._log:
-            formatted_msg = f"[{self.epic}] {message}"
-            if import_uid:
-                formatted_msg = f"[{import_uid}] {formatted_msg}"
-                
-            if severity == Severity.DEBUG:
-                self._log.debug(formatted_msg)
-            elif severity == Severity.INFO:
-                self._log.info(formatted_msg)
-            elif severity == Severity.WARNING:
-                self._log.warning(formatted_msg)
-            elif severity == Severity.ERROR:
-                self._log.error(formatted_msg)
-            elif severity == Severity.CRITICAL:
-                self._log.critical(formatted_msg)
+        log = self._logger
+        if not log or not log.isEnabledFor(_LOG_LEVELS[severity]):
+            return
+        if import_uid:
+            self._log_dispatch[severity]("[%s] [%s] %s", import_uid, self.epic, message)
+        else:
+            self._log_dispatch[severity]("[%s] %s", self.epic, message)
 
     # === GESTIONE STATO E LIFECYCLE ===
     
     def is_completed(self) -> bool:
         """Controlla se sistema è in stato completato"""
-        return self._params.get('systemCompleted', False)
+        return self._completed
     
     def set_completed(self):
         """Imposta sistema come completato"""
-        self._params['systemCompleted'] = True
+        self._completed = self._params['systemCompleted'] = True
         self._state_updated = True
     
     def is_error_state(self) -> bool:
         """Controlla se sistema è in errore"""
-        return self._params.get('systemError', False)
+        return self._error
     
     def set_error_state(self):
         """Imposta sistema in errore"""
-        self._params['systemError'] = True
+        self._error = self._params['systemError'] = True
         self._state_updated = True
 
+    def __getstate__(self) -> tuple:
+        """
+        Snapshot per il checkpoint: tupla in ordine fisso dei soli campi
+        persistenti, azione come int. Più compatta e veloce da serializzare
+        del dict di attributi di default. Include le richieste ordine non
+        ancora prelevate dal Gateway e i tempi di submit; l'ultimo elemento
+        sono i valori degli slot elencati in PERSISTENT_SLOTS dalla sottoclasse.
+        """
+        return (self._config, self._completed, self._error, self.blocked,
+                self._system_action, self.system_signal, self._state, self._params,
+                self._system_params, tuple(self._order_requests),
+                self.max_order_submit_time_in_secs, self.order_submit_time_delay_in_secs,
+                self.frame_miss_updates_in_secs,
+                tuple(getattr(self, name) for name in self.PERSISTENT_SLOTS))
+
+    def __setstate__(self, state: tuple):
+        """
+        Ripristino da __getstate__: riesegue __init__ con la configurazione
+        salvata per ricreare le strutture di runtime, poi riapplica i campi.
+        Logger e binding al portfolio vanno reimpostati dal chiamante.
+        """
+        (config, completed, error, blocked, system_action, system_signal,
+         system_state, params, system_params, order_requests,
+         max_submit_time, submit_time_delay, frame_miss_updates, slot_values) = state
+        type(self).__init__(self, config)
+        self._completed = completed
+        self._error = error
+        self.blocked = blocked
+        self._system_action = system_action
+        self.system_signal = system_signal
+        self._state = system_state
+        self._params = params
+        self._system_params = system_params
+        self._order_requests.extend(order_requests)
+        self.max_order_submit_time_in_secs = max_submit_time
+        self.order_submit_time_delay_in_secs = submit_time_delay
+        self.frame_miss_updates_in_secs = frame_miss_updates
+        for name, value in zip(self.PERSISTENT_SLOTS, slot_values):
+            setattr(self, name, value)
+
+    def _sync_status_flags(self):
+        """Riallinea _completed/_error a _params dopo un ripristino dello stato"""
+        self._completed = self._params.get('systemCompleted', False)
+        self._error = self._params.get('systemError', False)
+
     # === GESTIONE ORDINI ===
     
     def open_position(self, op_type: OrderOpType, qty: float, 
@@ -481,15 +937,12 @@ class BaseSystem(ABC):
         
         Crea ordine e lo mette nella coda di elaborazione del Gateway.
         """
-        order_request = self._create_order_request(
-            op_type=op_type,
-            qty=qty,
-            stop_price=stop_price,
-            **kwargs
-        )
-        self._order_requests.append(order_request)
-        self.consoleLog(f"Richiesta apertura: {op_type.name} {qty} @ stop {stop_price}", 
-                       Severity.INFO)
+        order_request = self._make_order(op_type, qty)
+        order_request['stop_price'] = stop_price
+        if kwargs:
+            order_request.update(kwargs)
+        if self._enqueue_order_request(order_request):
+            self.info_log("Richiesta apertura: %s %s @ stop %s", _OOT_NAMES[op_type], qty, stop_price)
 
     def close_position(self, qty: float = 0, **kwargs):
         """
@@ -497,66 +950,171 @@ class BaseSystem(ABC):
         
         Se qty=0, chiude tutta la posizione.
         """
-        order_request = self._create_order_request(
-            op_type=OrderOpType.SELL,  # Sarà convertito in base alla posizione attuale
-            qty=qty,
-            is_close=True,
-            **kwargs
-        )
+        # SELL sarà convertito in base alla posizione attuale
+        order_request = self._make_order(OrderOpType.SELL, qty)
+        order_request['is_close'] = True
+        if kwargs:
+            order_request.update(kwargs)
+        if self._enqueue_order_request(order_request):
+            self.info_log("Richiesta chiusura: %s", qty if qty > 0 else 'tutto')
+
+    def _enqueue_order_request(self, order_request: dict) -> bool:
+        """
+        Accoda la richiesta ordine per il Gateway.
+
+        A coda piena la deque scarterebbe in silenzio la richiesta più
+        vecchia: la richiesta nuova viene invece rifiutata e il system va in
+        errore, perché il Gateway non sta prelevando gli ordini.
+
+        Returns:
+            True se accodata, False se la coda è piena
+        """
+        if len(self._order_requests) >= ORDER_REQUESTS_MAX_LEN:
+            self.consoleLog(f"Coda richieste ordine piena ({ORDER_REQUESTS_MAX_LEN}), "
+                            f"ordine {_OOT_NAMES[order_request['op_type']]} scartato",
+                            Severity.ERROR)
+            self.set_error_state()
+            return False
         self._order_requests.append(order_request)
-        self.consoleLog(f"Richiesta chiusura: {qty if qty > 0 else 'tutto'}", 
-                       Severity.INFO)
+        return True
 
-    def _create_order_request(self, **kwargs) -> dict:
+    def pop_order_request(self):
         """
-        Crea struttura richiesta ordine standard.
-        
-        Ritorna dizionario con tutti i campi necessari per il Gateway.
+        Preleva la richiesta ordine più vecchia, nell'ordine di invio al broker.
+        Usata dal Gateway: while system.has_order_requests: system.pop_order_request()
+
+        Returns:
+            Richiesta ordine, None se la coda è vuota
         """
+        return self._order_requests.popleft() if self._order_requests else None
+
+    @property
+    def has_order_requests(self) -> bool:
+        """True se ci sono richieste ordine da prelevare"""
+        return bool(self._order_requests)
+
+    def _build_order_template(self) -> dict:
+        """Campi invarianti di ogni richiesta ordine del system"""
         return {
             'epic': self.epic,
             'system': self.__class__.__name__,
             'timestamp': 0,  # Sarà popolato dal TradeMgr
             'author': OrderAuthorType.AUTHOR_SYSTEM,
-            **kwargs
         }
 
+    def _make_order(self, op_type: OrderOpType, qty: float) -> dict:
+        """
+        Richiesta ordine dal template precalcolato: copia a livello C del
+        dict invariante, senza merge di **kwargs.
+        """
+        order_request = self._order_template.copy()
+        order_request['op_type'] = op_type
+        order_request['qty'] = qty
+        return order_request
+
+    def _create_order_request(self, **kwargs) -> dict:
+        """
+        Crea struttura richiesta ordine standard.
+        
+        Ritorna dizionario con tutti i campi necessari per il Gateway.
+        """
+        order_request = self._order_template.copy()
+        order_request.update(kwargs)
+        return order_request
+
     # === CALLBACK EVENTI (da sovrascrivere se necessario) ===
     
-    def on_order_accepted(self, order: dict):
+    # I callback ordini ricevono dal TradeMgr il TradeOrder a slot
+    # (order_lifecycle_management), con lo stato negli attributi piatti:
+    # nessuna conversione a dict tra TradeMgr e system
+
+    def on_order_accepted(self, order: 'TradeOrder'):
         """Chiamata quando ordine accettato dal broker"""
-        self.consoleLog(f"Ordine accettato: {order.get('id', 'N/A')}", Severity.INFO)
+        self.info_log("Ordine accettato: %s", order.id)
     
-    def on_order_filled(self, order: dict, time_now: int):
+    def on_order_filled(self, order: 'TradeOrder', time_now: int):
         """Chiamata quando ordine eseguito dal broker"""
-        filled_qty = order.get('status', {}).get('filled', 0)
-        avg_price = order.get('status', {}).get('avgFillPrice', 0)
-        self.consoleLog(f"Ordine eseguito: {filled_qty} @ {avg_price}", Severity.INFO)
+        self.info_log("Ordine eseguito: %s @ %s", order.filled, order.avgFillPrice)
         
         # Nel sistema reale gestisco anche le azioni on_filled per ordini composti
-        if order.get('authorType') == OrderAuthorType.AUTHOR_SYSTEM:
-            action, qty, stop_price = order.get('onFilledAction', (SystemAction.NOACTION, 0, 0))
-            if action != SystemAction.NOACTION:
+        if order.authorType == _OAT.AUTHOR_SYSTEM:
+            action, qty, stop_price = order.onFilledAction or _NO_FILLED_ACTION
+            if action != _NOACTION:
                 # Eseguo la seconda parte di un ordine composto (es. girata posizione)
-                if action == SystemAction.ACTION_BUY:
-                    self.consoleLog(f"BUY(2/2): Apro posizioni {qty}", Severity.INFO)
+                if action == _ACTION_BUY:
+                    self.info_log("BUY(2/2): Apro posizioni %s", qty)
                     self.open_position(OrderOpType.BUY, qty, stop_price=stop_price)
-                elif action == SystemAction.ACTION_SELL:
-                    self.consoleLog(f"SELL(2/2): Apro posizioni {qty}", Severity.INFO)
+                elif action == _ACTION_SELL:
+                    self.info_log("SELL(2/2): Apro posizioni %s", qty)
                     self.open_position(OrderOpType.SELL, qty, stop_price=stop_price)
     
-    def on_order_error(self, order: dict):
+    def on_order_error(self, order: 'TradeOrder'):
         """Chiamata quando errore su ordine"""
-        error_msg = order.get('status', {}).get('errorMessage', 'Errore sconosciuto')
+        error_msg = order.errorMessage or 'Errore sconosciuto'
         self.consoleLog(f"Errore ordine: {error_msg}", Severity.ERROR)
         
         # Nel sistema reale: se errore su ordine automatico, metto sistema in errore
-        if order.get('authorType') != OrderAuthorType.AUTHOR_USER:
+        if order.authorType != _OAT.AUTHOR_USER:
             self.set_error_state()
 
 
+# Tabella di salto delle azioni eseguibili da _execute_action
+# (handler, argomenti fissi); BUY e SELL condividono _open_or_flip
+BaseSystem._ACTION_HANDLERS = {
+    _ACTION_BUY: (BaseSystem._open_or_flip, (_ACTION_BUY, OrderOpType.BUY, 1.0)),
+    _ACTION_SELL: (BaseSystem._open_or_flip, (_ACTION_SELL, OrderOpType.SELL, -1.0)),
+    _ACTION_FLAT: (BaseSystem._handle_flat, ()),
+}
+
+
 # === ESEMPIO IMPLEMENTAZIONE SISTEMA CONCRETO ===
 
+@dataclass(slots=True)
+class FUTMState:
+    """
+    Stato persistito di FUTM a layout fisso: accesso a slot invece di chiavi
+    stringa, e serializzabile come tupla di campi in ordine fisso.
+    """
+    trade_op_action: int = 0        # Azione configurata dal signal (SystemAction)
+    target_qty: float = 0.0         # Quantità da eseguire
+    current_position: float = 0.0   # Posizione all'inizializzazione
+    params_raw: dict = None         # Parametri utente del system
+
+    def to_tuple(self) -> tuple:
+        """Campi in ordine di dichiarazione, per il salvataggio"""
+        return astuple(self)
+
+    @classmethod
+    def from_saved(cls, state) -> 'FUTMState':
+        """
+        Ricostruisce lo stato da tupla (to_tuple) o da dict dei campi.
+
+        Accetta anche il dict dello stato FUTM precedente a FUTMState
+        ({'tradeOp': {'systemAction': ...}, 'params': ...}); una chiave
+        sconosciuta solleva ValueError invece di perdere stato in silenzio.
+        """
+        if isinstance(state, dict):
+            names = {f.name for f in fields(cls)}
+            values = {}
+            for key, value in state.items():
+                if key == 'tradeOp':
+                    trade_op = value or {}
+                    values['trade_op_action'] = int(trade_op.get('systemAction', _NOACTION))
+                elif key == 'params':
+                    values['params_raw'] = value
+                elif key in names:
+                    values[key] = value
+                else:
+                    raise ValueError(f"FUTMState: chiave di stato sconosciuta {key!r}")
+            return cls(**values)
+        return cls(*state)
+
+
+# Azione FUTM per ogni valore del parametro signal
+_FUTM_SIGNAL_ACTIONS = {'BUY': _ACTION_BUY, 'SELL': _ACTION_SELL,
+                        'FLAT': _ACTION_FLAT, 'HOLD': _SA.ACTION_HOLD}
+
+
 class FUTMExample(BaseSystem):
     """
     Esempio semplificato del sistema FUTM dal mio codice reale.
@@ -564,24 +1122,29 @@ class FUTMExample(BaseSystem):
     FUTM gestisce segnali direzionali (BUY/SELL/FLAT) con quantità configurabili.
     Questo esempio mostra il pattern di implementazione.
     """
+
+    PARAM_SCHEMA = (('signal', True, _is_signal_str),
+                    ('qty', True, None))
+
+    __slots__ = ()
+
+    STATE_CLASS = FUTMState
+
+    # Distanza dello stop dal prezzo corrente (2%)
+    DEFAULT_STOP_PCT = 0.02
+
+    # Moltiplicatori dello stop precalcolati: per tick resta una sola moltiplicazione
+    _STOP_MUL_BUY = 1.0 - DEFAULT_STOP_PCT
+    _STOP_MUL_SELL = 1.0 + DEFAULT_STOP_PCT
     
     def do_validate_signal(self, signal: dict, system_params: dict, 
                           portfolio: dict, import_uid: str = "") -> bool:
         """Validazione specifica FUTM"""
-        # Controllo parametro signal obbligatorio
-        if not self.check_system_param(system_params, 'signal',
-                                     "Parametro signal non impostato", "", import_uid):
-            return False
-            
-        # Controllo parametro quantity obbligatorio  
-        if not self.check_system_param(system_params, 'qty',
-                                     "Parametro qty non impostato", "", import_uid):
-            return False
-            
-        # Validazione valore signal
-        signal_value = self.get_system_param(system_params, 'signal')
-        if signal_value not in ['BUY', 'SELL', 'FLAT', 'HOLD']:
-            self.consoleLog(f"Signal non valido: {signal_value}", Severity.ERROR, import_uid)
+        # signal e qty obbligatori, signal valido: un solo passaggio sullo schema
+        values, bad_key = self._extract_params(system_params)
+        if values is None:
+            self.consoleLog(f"Parametro {bad_key} non impostato o non valido",
+                            Severity.ERROR, import_uid)
             return False
             
         return True
@@ -589,28 +1152,18 @@ class FUTMExample(BaseSystem):
     def do_initialize_system(self, portfolio: dict, import_uid: str, 
                            is_first_init: bool) -> bool:
         """Inizializzazione specifica FUTM"""
-        trade_op = self._state['tradeOp'] = {}
-        params = self._state['params']
-        position = portfolio.get(self.epic, {}).get('qty', 0.0)
+        state = self._state
+        params = state.params_raw = self._system_params
         
         # Determino azione sistema in base al signal
         signal_value = params['signal']['value']
-        if signal_value == 'BUY':
-            trade_op['systemAction'] = SystemAction.ACTION_BUY
-        elif signal_value == 'SELL':
-            trade_op['systemAction'] = SystemAction.ACTION_SELL
-        elif signal_value == 'FLAT':
-            trade_op['systemAction'] = SystemAction.ACTION_FLAT
-        elif signal_value == 'HOLD':
-            trade_op['systemAction'] = SystemAction.ACTION_HOLD
-        else:
-            trade_op['systemAction'] = SystemAction.NOACTION
+        state.trade_op_action = _FUTM_SIGNAL_ACTIONS.get(signal_value, _NOACTION)
             
         # Preparo i parametri operativi
-        self._state['target_qty'] = self.get_system_param(params, 'qty')
-        self._state['current_position'] = position
+        state.target_qty = self.get_system_param(params, 'qty')
+        state.current_position = (portfolio.get(self.epic) or _EMPTY_POSITION)['qty']
         
-        self.consoleLog(f"FUTM inizializzato: {signal_value} qty={self._state['target_qty']}", 
+        self.consoleLog(f"FUTM inizializzato: {signal_value} qty={state.target_qty}", 
                        Severity.INFO, import_uid)
         return True
     
@@ -625,34 +1178,31 @@ class FUTMExample(BaseSystem):
             return SystemAction.NOACTION, 0, 0
             
         # Recupero l'azione configurata
-        trade_op = self._state['tradeOp']
-        action = trade_op.get('systemAction', SystemAction.NOACTION)
-        qty = self._state.get('target_qty', 0)
+        action = self._state.trade_op_action
+        qty = self._state.target_qty
         
-        # Calcolo stop price (esempio: 2% dal prezzo corrente)
+        # Calcolo stop price (default: 2% dal prezzo corrente)
         stop_price = 0
-        if action in [SystemAction.ACTION_BUY, SystemAction.ACTION_SELL]:
-            stop_percentage = 0.02
-            if action == SystemAction.ACTION_BUY:
-                stop_price = frame_data['close'] * (1 - stop_percentage)
-            else:
-                stop_price = frame_data['close'] * (1 + stop_percentage)
+        if action == _ACTION_BUY:
+            stop_price = frame_data['close'] * self._STOP_MUL_BUY
+        elif action == _ACTION_SELL:
+            stop_price = frame_data['close'] * self._STOP_MUL_SELL
         
         # Dopo aver eseguito il segnale, completo il sistema
-        if action != SystemAction.NOACTION:
-            self.consoleLog(f"Eseguo segnale: {action.name} qty={qty}", Severity.INFO)
+        if action != _NOACTION:
+            self.info_log("Eseguo segnale: %s qty=%s", _SA_NAMES[action], qty)
             # Il sistema si completerà automaticamente dopo l'esecuzione dell'ordine
         
         return action, qty, stop_price
     
-    def do_resume_system(self, frame_data: List[dict], portfolio: dict,
+    def do_resume_system(self, bars: np.ndarray, portfolio: dict,
                         chart: Any, state: dict, log: list,
                         time_now: int, import_uid: str) -> bool:
         """Ripresa FUTM dopo crash"""
         # Ripristino stato salvato
         if state:
-            self._state.update(state)
-            
+            self._state = FUTMState.from_saved(state)
+
         # FUTM è semplice, non ha indicatori complessi da ricalcolare
         self.consoleLog("FUTM ripristinato correttamente", Severity.INFO, import_uid)
         return True
@@ -0,0 +1,294 @@
+"""
+MAOTrade - Code interne dell'Account Manager
+
+Estratto dal sistema reale: le strutture che separano il traffico in uscita
+dall'Account Manager verso il TradeMgr in due corsie.
+
+- SPSCRing: ring limitato per i tick del feed (un produttore, il thread del
+  feed; un consumatore, il main loop dell'Account Manager)
+- MPSCQueue: coda per gli eventi rari ma prioritari (ordini eseguiti,
+  apertura/chiusura sessione) prodotti da più thread
+- SharedBarRing: barre OHLCV a layout fisso in shared memory, lette dal
+  TradeMgr come vista NumPy senza pickle né copie
+- SpillWriter/SpillReader: livello di overflow su file SQLite in tmpfs
+  quando il TradeMgr non tiene il ritmo e la coda verso di lui è piena
+
+Il main loop svuota prima gli eventi e poi un lotto limitato di tick, così un
+ordine eseguito non resta mai in coda dietro migliaia di tick.
+
+Questo NON è codice eseguibile, ma una vetrina dell'architettura implementata.
+"""
+
+from collections import deque
+from multiprocessing.shared_memory import SharedMemory
+import glob
+import os
+import pickle
+import sqlite3
+import time
+
+import numpy as np
+
+
+# Layout fisso di una barra OHLCV nel ring in shared memory
+BAR_DTYPE = np.dtype([('ts', 'i8'), ('o', 'f4'), ('h', 'f4'), ('l', 'f4'),
+                      ('c', 'f4'), ('v', 'f4')])
+
+# Header del segmento: cursore di scrittura (numero barre scritte)
+_BAR_HEADER_SIZE = 8
+
+
+def bar_ring_name(id_account: int, epic: str, time_frame: int) -> str:
+    """Nome del segmento shared memory, calcolabile sia dall'Account Manager che dal TradeMgr"""
+    return f"maotrade_{id_account}_{epic.replace('.', '_')}_{time_frame}"
+
+
+class SPSCRing:
+    """
+    Ring buffer single-producer / single-consumer a capacità fissa.
+
+    Capacità potenza di due: l'indice nello slot è `idx & mask` invece di un
+    modulo. `_tail` è scritto solo dal produttore e `_head` solo dal
+    consumatore, quindi non serve nessun lock: lo slot viene scritto prima di
+    pubblicare il nuovo `_tail`.
+
+    Fallback Python dell'estensione C spsc_ring, con la stessa interfaccia.
+    """
+
+    __slots__ = ('_buf', '_mask', '_head', '_tail')
+
+    def __init__(self, capacity: int):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f"Capacità ring {capacity} non potenza di due")
+        self._buf = [None] * capacity
+        self._mask = capacity - 1
+        self._head = 0      # Prossimo slot da leggere (consumatore)
+        self._tail = 0      # Prossimo slot da scrivere (produttore)
+
+    def push(self, item) -> bool:
+        """
+        Inserisce un elemento. Solo thread produttore.
+
+        Returns:
+            False se il ring è pieno
+        """
+        tail = self._tail
+        if tail - self._head > self._mask:
+            return False
+        self._buf[tail & self._mask] = item
+        self._tail = tail + 1
+        return True
+
+    def pop_many(self, out: list, max_items: int) -> int:
+        """
+        Preleva fino a max_items elementi scrivendoli in out. Solo thread consumatore.
+
+        Returns:
+            Numero di elementi scritti in out
+        """
+        head = self._head
+        n = min(max_items, self._tail - head)
+        buf = self._buf
+        mask = self._mask
+        for i in range(n):
+            idx = (head + i) & mask
+            out[i] = buf[idx]
+            buf[idx] = None
+        self._head = head + n
+        return n
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+
+class MPSCQueue:
+    """
+    Coda multi-producer / single-consumer non limitata per eventi prioritari.
+
+    Stesso contratto della coda intrusiva di Vyukov: enqueue senza lock da
+    qualsiasi thread, dequeue da un solo consumatore. In CPython
+    deque.append/popleft sono atomici, quindi nessun mutex né condition.
+    """
+
+    __slots__ = ('_items',)
+
+    def __init__(self):
+        self._items = deque()
+
+    def put(self, item):
+        """Accoda un evento. Qualsiasi thread."""
+        self._items.append(item)
+
+    def drain(self) -> list:
+        """Preleva tutti gli eventi presenti. Solo thread consumatore."""
+        items = []
+        popleft = self._items.popleft
+        try:
+            while True:
+                items.append(popleft())
+        except IndexError:
+            pass
+        return items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SharedBarRing:
+    """
+    Ring di barre OHLCV in shared memory POSIX, un solo scrittore.
+
+    Lo scrittore (thread feed dell'Account Manager) copia ogni barra nello
+    slot `cursore & mask` e poi pubblica il nuovo cursore nell'header. Il
+    lettore (TradeMgr, anche in altro processo) apre lo stesso segmento per
+    nome e legge le barre nuove come vista NumPy sul buffer mappato: nessuna
+    serializzazione, solo la memcpy della barra lato scrittore.
+    """
+
+    def __init__(self, capacity: int, name: str, create: bool = True):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f"Capacità ring {capacity} non potenza di due")
+        self._capacity = capacity
+        self._mask = capacity - 1
+        self._owner = create
+        size = _BAR_HEADER_SIZE + capacity * BAR_DTYPE.itemsize
+        try:
+            self._shm = SharedMemory(name=name, create=create, size=size)
+        except FileExistsError:
+            # Segmento rimasto in /dev/shm da un crash dello scrittore: il
+            # nome è fisso per sottoscrizione, lo elimino e lo ricreo vuoto
+            stale = SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self._shm = SharedMemory(name=name, create=True, size=size)
+        self._cursor = np.ndarray((1,), dtype=np.int64, buffer=self._shm.buf)
+        self._bars = np.ndarray((capacity,), dtype=BAR_DTYPE, buffer=self._shm.buf,
+                                offset=_BAR_HEADER_SIZE)
+        if create:
+            self._cursor[0] = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def write(self, ts: int, o: float, h: float, l: float, c: float, v: float):
+        """Scrive una barra. Solo thread scrittore."""
+        cursor = int(self._cursor[0])
+        self._bars[cursor & self._mask] = (ts, o, h, l, c, v)
+        self._cursor[0] = cursor + 1
+
+    def read_since(self, cursor: int) -> tuple:
+        """
+        Legge le barre scritte dopo cursor.
+
+        Se il lettore è rimasto indietro di più di `capacity` barre riparte
+        dalla più vecchia ancora presente.
+
+        Returns:
+            Tupla (barre, nuovo cursore). Le barre sono una vista sul buffer
+            condiviso, salvo quando attraversano la fine del ring (copia).
+        """
+        end = int(self._cursor[0])
+        start = max(cursor, end - self._capacity)
+        first = start & self._mask
+        last = first + (end - start)
+        if last <= self._capacity:
+            return self._bars[first:last], end
+        return np.concatenate((self._bars[first:], self._bars[:last - self._capacity])), end
+
+    def close(self):
+        """Rilascia la mappatura; lo scrittore elimina anche il segmento"""
+        self._cursor = None
+        self._bars = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class SpillWriter:
+    """
+    Overflow su disco dei messaggi verso il TradeMgr (modello Turbo Queue).
+
+    Quando la coda in uscita è piena i messaggi vengono accodati in un file
+    SQLite `<prefix>_load_<seq>.sqlite` su tmpfs. Raggiunte batch_rows righe
+    (o max_age_secs dall'apertura) il lotto viene chiuso e rinominato in
+    `<prefix>_ready_<seq>.sqlite`: la rename è atomica, il lettore vede solo
+    lotti completi e scrittore e lettore non condividono nessun lock.
+    """
+
+    def __init__(self, directory: str, prefix: str, batch_rows: int = 1000,
+                 max_age_secs: float = 1.0):
+        self._directory = directory
+        self._prefix = prefix
+        self._batch_rows = batch_rows
+        self._max_age_secs = max_age_secs
+        self._seq = 0
+        self._conn = None
+        self._path = ""
+        self._rows = 0
+        self._opened_at = 0.0
+
+    @property
+    def active(self) -> bool:
+        """True se c'è un lotto aperto: i messaggi successivi vanno qui per mantenere l'ordine"""
+        return self._conn is not None
+
+    def add(self, messages: list):
+        """Accoda messaggi nel lotto corrente, aprendone uno nuovo se serve"""
+        if self._conn is None:
+            self._open_batch()
+        self._conn.executemany(
+            "INSERT INTO messages (payload) VALUES (?)",
+            [(pickle.dumps(message, pickle.HIGHEST_PROTOCOL),) for message in messages]
+        )
+        self._rows += len(messages)
+        if self._rows >= self._batch_rows:
+            self.close_batch()
+
+    def maybe_close_batch(self):
+        """Chiude il lotto aperto da più di max_age_secs, da chiamare ad ogni iterazione"""
+        if self._conn is not None and time.monotonic() - self._opened_at >= self._max_age_secs:
+            self.close_batch()
+
+    def close_batch(self):
+        """Chiude il lotto corrente e lo rende visibile al lettore"""
+        if self._conn is None:
+            return
+        self._conn.commit()
+        self._conn.close()
+        self._conn = None
+        os.rename(self._path, self._path.replace('_load_', '_ready_'))
+
+    def _open_batch(self):
+        os.makedirs(self._directory, exist_ok=True)
+        self._seq += 1
+        self._path = os.path.join(self._directory, f"{self._prefix}_load_{self._seq:08d}.sqlite")
+        self._conn = sqlite3.connect(self._path)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE messages (payload BLOB)")
+        self._rows = 0
+        self._opened_at = time.monotonic()
+
+
+class SpillReader:
+    """
+    Lato TradeMgr dell'overflow: legge, in ordine di sequenza, i lotti
+    completi lasciati da SpillWriter e li elimina.
+    """
+
+    def __init__(self, directory: str, prefix: str):
+        self._pattern = os.path.join(directory, f"{prefix}_ready_*.sqlite")
+
+    def read_ready(self) -> list:
+        """Messaggi di tutti i lotti pronti, nell'ordine in cui erano stati scritti"""
+        messages = []
+        for path in sorted(glob.glob(self._pattern)):
+            conn = sqlite3.connect(path)
+            try:
+                rows = conn.execute("SELECT payload FROM messages ORDER BY rowid").fetchall()
+            finally:
+                conn.close()
+            os.remove(path)
+            messages.extend(pickle.loads(payload) for payload, in rows)
+        return messages
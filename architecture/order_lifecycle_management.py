@@ -9,10 +9,32 @@ sistemi di trading che operano con denaro reale.
 Estratto dal codice reale - niente invenzioni, solo quello che ho implementato.
 """
 
+from collections import deque
+from dataclasses import dataclass, asdict
 from enum import IntEnum
+from functools import lru_cache
 from typing import Optional
+import heapq
+import itertools
+import atexit
+import json
+import os
+import sys
+import threading
 import time
 
+import numpy as np
+
+from _order_sweep import find_due
+from message_transport import MPSCQueue
+
+# orjson opzionale: i payload DAO vengono codificati una sola volta in bytes
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 # ============================================================================
 # ENUM STATI ORDINI - Come ho definito gli stati nel sistema reale
@@ -45,6 +67,50 @@ class DealStatus(IntEnum):
     TOTRASH = 6        # Da eliminare dalla coda
 
 
+# Eventi della state machine di DealStatus
+EV_SEND = 0         # Invio al broker di apertura/chiusura
+EV_SEND_STOP = 1    # Invio al broker di modifica stop
+EV_SUBMIT = 2       # Broker ha accettato l'ordine
+EV_DELAY = 3        # Errore temporaneo, retry successivo
+EV_REJECT = 4       # Rifiuto, errore di validazione o timeout
+EV_TRASH = 5        # Ordine concluso, da eliminare
+
+_ILLEGAL = 0xFF     # Transizione non ammessa: lo stato resta invariato
+
+
+def _build_transitions() -> bytes:
+    """
+    Tabella delle transizioni di DealStatus, indicizzata da (stato << 4) | evento.
+    Gli eventi fuori sequenza (es. conferma del broker su un ordine già
+    rifiutato o eliminato) trovano _ILLEGAL e vengono ignorati.
+    """
+    pending = {EV_SEND: DealStatus.SUBMITTING, EV_SEND_STOP: DealStatus.EXECUTING,
+               EV_DELAY: DealStatus.DELAYED, EV_REJECT: DealStatus.REJECTED,
+               EV_TRASH: DealStatus.TOTRASH}
+    in_flight = {EV_SUBMIT: DealStatus.SUBMITTED, EV_DELAY: DealStatus.DELAYED,
+                 EV_REJECT: DealStatus.REJECTED, EV_TRASH: DealStatus.TOTRASH}
+    legal = {
+        DealStatus.NOT_SUBMITTED: pending,
+        DealStatus.DELAYED: pending,
+        DealStatus.SUBMITTING: in_flight,
+        DealStatus.EXECUTING: in_flight,
+        DealStatus.SUBMITTED: {EV_SUBMIT: DealStatus.SUBMITTED, EV_REJECT: DealStatus.REJECTED,
+                               EV_TRASH: DealStatus.TOTRASH},
+        DealStatus.REJECTED: {EV_REJECT: DealStatus.REJECTED, EV_TRASH: DealStatus.TOTRASH},
+    }
+    table = bytearray([_ILLEGAL]) * (len(DealStatus) << 4)
+    for state, moves in legal.items():
+        for event, new_state in moves.items():
+            table[(state << 4) | event] = new_state
+    return bytes(table)
+
+
+_TRANSITIONS = _build_transitions()
+
+# Stati in attesa di invio al broker
+_PENDING = frozenset((DealStatus.NOT_SUBMITTED.value, DealStatus.DELAYED.value))
+
+
 class OrderAction(IntEnum):
     """
     Tipologia di azione dell'ordine
@@ -54,61 +120,153 @@ class OrderAction(IntEnum):
     MODIFY_POSITION = 3
 
 
+# Dispatch basato su tipo azione: evento di invio e indice del lotto
+# (aperture, chiusure, stop) in process_order_list
+_ACTION_DISPATCH = {
+    OrderAction.OPEN_POSITION: (EV_SEND, 0),
+    OrderAction.CLOSE_POSITION: (EV_SEND, 1),
+    OrderAction.MODIFY_POSITION: (EV_SEND_STOP, 2),
+}
+
+
+class OrderEventKind(IntEnum):
+    """
+    Esito di una richiesta al broker, notificato dai thread del broker
+    all'Account Manager tramite OrderEvent
+    """
+    SUBMITTED = 0       # Accettato dal broker, payload = dealReference
+    DELAYED = 1         # Errore temporaneo, payload = messaggio errore
+    REJECTED = 2        # Rifiutato, payload = messaggio errore
+    TOTRASH = 3         # Ordine concluso, da eliminare
+
+
 # ============================================================================
 # STRUTTURA ORDINE - Come ho strutturato gli ordini nel BaseSystem
 # ============================================================================
 
+# Campi dello stato ordine, raggruppati sotto 'status' nella forma a dict
+STATUS_FIELDS = ('execState', 'dealReference', 'filled', 'avgFillPrice', 'pnl',
+                 'errorCode', 'errorMessage', 'filledTriggered', 'persisted')
+
+
+@dataclass(slots=True)
+class TradeOrder:
+    """
+    Richiesta di ordine secondo la struttura che uso nel BaseSystem reale.
+    Ogni campo ha un ruolo preciso nel tracking dell'ordine.
+
+    Lo stato ordine è nello stesso oggetto (un solo accesso ad attributo
+    nei callback); status_view() lo ricompone nella forma annidata.
+    """
+    id: int = 0                         # ID database (popolato al salvataggio)
+    epic: str = ""                      # Strumento finanziario
+    epicDescr: str = ""                 # Descrizione per logging
+    opType: Optional[int] = None        # OrderOpType: BUY/SELL
+    orderType: Optional[int] = None     # OrderType: MKT/STP
+    posCmd: Optional[int] = None        # OrderPosCmd: NEW/CLOSE
+    qty: float = 0.0                    # Quantità (sempre positiva)
+    stopPrice: float = 0.0              # Prezzo di stop
+    author: str = ""                    # Chi ha creato l'ordine
+    authorType: Optional[int] = None    # OrderAuthorType: SYSTEM/USER
+    maxSubmitTimeSec: int = 120         # Timeout submit
+    submitDelayTimeSec: int = 30        # Delay retry
+    completeSystemOnFilled: bool = False  # Auto-complete
+    onFilledAction: tuple = (0, 0.0, 0.0)  # Azione dopo fill (SystemAction.NOACTION, 0, 0)
+
+    # STATO ORDINE - Questo è il cuore del tracking
+    execState: OrderExecState = OrderExecState.JUST_CREATED
+    dealReference: str = ""             # ID broker
+    filled: float = 0.0                 # Quantità eseguita
+    avgFillPrice: float = 0.0           # Prezzo medio esecuzione
+    pnl: float = 0.0                    # P&L ordine
+    errorCode: int = 0                  # Codice errore broker
+    errorMessage: str = ""              # Messaggio errore
+    filledTriggered: bool = False       # Flag evento fill inviato
+    persisted: bool = False             # Ultimo aggiornamento scritto su database
+
+    def to_dict(self) -> dict:
+        """Struttura a dict con lo stato annidato, solo ai confini di serializzazione"""
+        out = asdict(self)
+        out['status'] = {name: out.pop(name) for name in STATUS_FIELDS}
+        return out
+
+
+def status_view(trade_order: TradeOrder) -> dict:
+    """Stato ordine come dict annidato, per il codice fuori dal percorso caldo"""
+    return {name: getattr(trade_order, name) for name in STATUS_FIELDS}
+
+
+@dataclass(slots=True)
+class OrderEvent:
+    """Evento ordine prodotto da un thread del broker"""
+    kind: OrderEventKind
+    orderId: int
+    payload: str = ""
+
+
+def order_json_default(obj):
+    """
+    Hook default= per orjson.dumps: serializza TradeOrder come dict con lo
+    stato annidato. Da usare con option=orjson.OPT_PASSTHROUGH_DATACLASS,
+    altrimenti orjson serializza il dataclass piatto senza chiamarlo.
+    """
+    if isinstance(obj, TradeOrder):
+        return obj.to_dict()
+    raise TypeError(f"Tipo {type(obj).__name__} non serializzabile")
+
+
 def create_trade_order(epic: str = "", op_type=None, order_type=None, 
                       pos_cmd=None, qty: float = 0, stop_price: float = 0.0,
                       author_type=None, author: str = "",
                       max_submit_time_sec: int = 120,
                       submit_time_delay_sec: int = 30,
                       complete_system_on_filled: bool = False,
-                      on_filled_action: tuple = None) -> dict:
+                      on_filled_action: tuple = None) -> TradeOrder:
     """
     Crea una richiesta di ordine secondo la struttura che uso nel BaseSystem reale.
     
-    Il dizionario ritornato è esattamente quello che uso in produzione.
-    Ogni campo ha un ruolo preciso nel tracking dell'ordine.
+    Ritorna un TradeOrder a slot con i campi di stato inclusi.
     """
     if on_filled_action is None:
         on_filled_action = (0, 0.0, 0.0)  # SystemAction.NOACTION, 0, 0
         
-    trade_order = {
-        'id': 0,                        # ID database (popolato al salvataggio)
-        'epic': epic,                   # Strumento finanziario
-        'epicDescr': "",               # Descrizione per logging
-        'opType': op_type,             # OrderOpType: BUY/SELL
-        'orderType': order_type,       # OrderType: MKT/STP
-        'posCmd': pos_cmd,             # OrderPosCmd: NEW/CLOSE
-        'qty': abs(qty),               # Quantità (sempre positiva)
-        'stopPrice': stop_price,       # Prezzo di stop
-        'author': author,              # Chi ha creato l'ordine
-        'authorType': author_type,     # OrderAuthorType: SYSTEM/USER
-        'maxSubmitTimeSec': max_submit_time_sec,    # Timeout submit
-        'submitDelayTimeSec': submit_time_delay_sec, # Delay retry
-        'completeSystemOnFilled': complete_system_on_filled,  # Auto-complete
-        'onFilledAction': on_filled_action,  # Azione dopo fill
-        
-        # STATO ORDINE - Questo è il cuore del tracking
-        'status': {
-            'execState': OrderExecState.JUST_CREATED,
-            'dealReference': "",        # ID broker
-            'filled': 0.0,             # Quantità eseguita
-            'avgFillPrice': 0.0,       # Prezzo medio esecuzione
-            'pnl': 0.0,                # P&L ordine
-            'errorCode': 0,            # Codice errore broker
-            'errorMessage': "",        # Messaggio errore
-            'filledTriggered': False   # Flag evento fill inviato
-        }
-    }
-    return trade_order
+    return TradeOrder(epic=epic, opType=op_type, orderType=order_type, posCmd=pos_cmd,
+                      qty=abs(qty), stopPrice=stop_price, author=author,
+                      authorType=author_type, maxSubmitTimeSec=max_submit_time_sec,
+                      submitDelayTimeSec=submit_time_delay_sec,
+                      completeSystemOnFilled=complete_system_on_filled,
+                      onFilledAction=on_filled_action)
 
 
 # ============================================================================  
 # CLASSE BASEORDER - Come gestisco gli ordini nell'Account Manager
 # ============================================================================
 
+# Messaggio di rifiuto precalcolato: sul percorso felice non si costruisce nessuna stringa
+_QTY_ZERO_ERROR = "ERRORE quantità zero non ammessa su nuove posizioni"
+
+
+@lru_cache(maxsize=256)
+def _validate_params(action: int, direction: int, qty_sign: int) -> tuple:
+    """
+    Esito della validazione per una combinazione di parametri ordine.
+    Funzione pura memoizzata: i retry e gli ordini con gli stessi parametri
+    non ripercorrono la catena di controlli.
+
+    Returns:
+        tuple: (ok, messaggio errore, inversione segno quantità)
+    """
+    # Validazione specifica per nuove posizioni
+    if action == OrderAction.OPEN_POSITION:
+        if direction not in (1, 2):
+            return False, f"ERRORE direzione {direction}. Valori ammessi sono 1 o 2", False
+        if qty_sign == 0:
+            return False, _QTY_ZERO_ERROR, False
+        # Ordine long: quantità positiva, ordine short: quantità negativa
+        return True, "", (direction == 1) == (qty_sign < 0)
+    return True, "", False
+
+
 class BaseOrder:
     """
     Rappresenta un ordine nell'Account Manager.
@@ -131,8 +289,8 @@ class BaseOrder:
         self.orderType: int = 0    # 0=MARKET, 1=LIMIT, 2=STOP
         self.stopPrice: float = 0.0
         
-        # Stato processing
-        self.dealStatus: DealStatus = DealStatus.NOT_SUBMITTED
+        # Stato processing: int grezzo di DealStatus, avanzato con transition()
+        self.dealStatus: int = DealStatus.NOT_SUBMITTED.value
         self.dealReference: str = ""
         self.errorMessage: str = ""
         
@@ -165,7 +323,7 @@ class BaseOrder:
         self.submitStart = time_now
         self.submitDeadline = time_now + max_submit_time_sec
         self.errorMessage = ""
-        self.dealStatus = DealStatus.NOT_SUBMITTED
+        self.dealStatus = DealStatus.NOT_SUBMITTED.value
         self.submitDelay = submit_time_delay_sec
         self.submitRetry = 0
         
@@ -177,132 +335,665 @@ class BaseOrder:
             bool: True se validazione OK, False se ci sono errori
         """
         if not self.epicBroker:
-            self.errorMessage = f"ERRORE Epic {self.epic} non trovato lato broker"
-            self.dealStatus = DealStatus.REJECTED
+            self.errorMessage = "ERRORE Epic " + self.epic + " non trovato lato broker"
+            self.transition(EV_REJECT)
+            return False
+
+        qty = self.qty
+        ok, error_msg, flip = _validate_params(int(self.action), self.direction,
+                                               (qty > 0) - (qty < 0))
+        if not ok:
+            self.errorMessage = error_msg
+            self.transition(EV_REJECT)
             return False
 
-        # Validazione specifica per nuove posizioni
-        if self.action == OrderAction.OPEN_POSITION:
-            if self.direction not in [1, 2]:
-                self.errorMessage = f"ERRORE direzione {self.direction}. Valori ammessi sono 1 o 2"
-                self.dealStatus = DealStatus.REJECTED
-                return False
-
-            if self.qty == 0:
-                self.errorMessage = f"ERRORE quantità zero non ammessa su nuove posizioni"
-                self.dealStatus = DealStatus.REJECTED
-                return False
-                
-            # Aggiustamento segno quantità basato su direzione
-            elif self.direction == 1 and self.qty < 0:
-                # Ordine long: quantità deve essere positiva
-                self.qty *= -1
-            elif self.direction == 2 and self.qty > 0:
-                # Ordine short: quantità deve essere negativa  
-                self.qty *= -1
+        # Aggiustamento segno quantità basato su direzione
+        if flip:
+            self.qty = -qty
 
         return True
     
-    def set_delayed(self, error_msg: str = ""):
+    @property
+    def deal_status(self) -> DealStatus:
+        """Stato processing come DealStatus, per il codice fuori dal percorso caldo"""
+        return DealStatus(self.dealStatus)
+
+    def transition(self, event: int) -> bool:
+        """
+        Avanza dealStatus secondo la tabella _TRANSITIONS.
+
+        Returns:
+            bool: False se la transizione non è ammessa (stato invariato)
+        """
+        new_status = _TRANSITIONS[(self.dealStatus << 4) | event]
+        if new_status == _ILLEGAL:
+            return False
+        self.dealStatus = new_status
+        return True
+
+    def set_delayed(self, time_now: int, error_msg: str = "") -> bool:
         """
         Mette l'ordine in stato DELAYED per retry successivo.
         
         Args:
+            time_now: Timestamp corrente (quello del tick dell'Account Manager)
             error_msg: Messaggio di errore opzionale
         """
-        self.dealStatus = DealStatus.DELAYED
+        if not self.transition(EV_DELAY):
+            return False
         if error_msg:
             self.errorMessage = error_msg
-        self.submitRetry = int(time.time()) + self.submitDelay
+        self.submitRetry = time_now + self.submitDelay
+        return True
         
-    def set_rejected(self, error_msg: str):
+    def set_rejected(self, error_msg: str) -> bool:
         """
         Mette l'ordine in stato REJECTED con messaggio errore.
         
         Args:
             error_msg: Messaggio di errore
         """
-        self.dealStatus = DealStatus.REJECTED
+        if not self.transition(EV_REJECT):
+            return False
         self.errorMessage = error_msg
+        return True
         
-    def set_submitted(self, deal_reference: str = ""):
+    def set_submitted(self, deal_reference: str = "") -> bool:
         """
         Mette l'ordine in stato SUBMITTED dopo invio al broker.
         
         Args:
             deal_reference: ID ordine restituito dal broker
         """
+        if not self.transition(EV_SUBMIT):
+            return False
         if deal_reference:
             self.dealReference = deal_reference
-        self.dealStatus = DealStatus.SUBMITTED
+        return True
+
+
+# Versione compilata (Cython, base_order.pyx) di BaseOrder. Se l'estensione
+# non è compilata resta la classe Python qui sopra, con la stessa interfaccia.
+try:
+    from base_order import BaseOrder
+except ImportError:
+    pass
 
 
 # ============================================================================
 # ORDER PROCESSING - Come processo la coda ordini nell'Account Manager
 # ============================================================================
 
-def process_order_list(order_list: list, time_now: int,
-                      do_async_request_order_open,
-                      do_async_request_order_close, 
-                      do_async_request_order_stop) -> int:
+def single_order_batch(do_async_request_order):
     """
-    Processa la coda di richiesta degli ordini con politica di submit e retry.
-    
-    Questa è la logica reale estratta dal BaseAccountManager.
-    Gestisce timeout, retry ed eliminazione ordini completati.
-    
-    Args:
-        order_list: Lista ordini da processare
-        time_now: Timestamp corrente
-        do_async_request_*: Callback per invio ordini (implementate dai broker specifici)
-        
-    Returns:
-        int: Numero ordini eliminati dalla coda
+    Adatta una callback di invio per singolo ordine all'interfaccia a lotti
+    di process_order_list, per i broker senza API di invio multiplo.
     """
-    trashed_orders = 0
-    
-    # Processo ogni ordine nella coda
-    for order in order_list:
-        if order.dealStatus in [DealStatus.NOT_SUBMITTED, DealStatus.DELAYED]:
+    def do_async_request_orders(orders: list):
+        for order in orders:
+            do_async_request_order(order)
+    return do_async_request_orders
+
+
+class OrderQueue:
+    """
+    Coda di richiesta degli ordini dell'Account Manager con politica di submit e retry.
+
+    Gli ordini in attesa (NOT_SUBMITTED / DELAYED) stanno in un heap ordinato
+    per istante del prossimo evento: subito per i nuovi ordini,
+    min(submitRetry, submitDeadline + 1) per quelli in retry. Ad ogni tick
+    si guarda solo la testa dell'heap, gli ordini non ancora dovuti non
+    costano nulla. Le voci dell'heap sono pigre: se nel frattempo l'ordine
+    ha cambiato stato viene scartato al pop.
+
+    Gli ordini TOTRASH vanno nella lista _trash e vengono rimossi dalla coda
+    quando sono più di 5, finendo nella free list _free: new_order() li
+    riusa (init_order reimposta tutti i campi) invece di allocare un nuovo
+    BaseOrder, a regime il ricambio degli ordini non alloca nulla.
+
+    I thread del broker non toccano mai gli ordini: pubblicano un OrderEvent
+    con post_event() e process_order_list applica gli eventi all'inizio del
+    tick, dal solo thread dell'Account Manager.
+    """
+
+    def __init__(self):
+        self.orders = {}                # orderId -> BaseOrder
+        self.events = MPSCQueue()       # OrderEvent dai thread del broker
+        self.time_now = 0               # Timestamp dell'ultimo tick processato
+        self._pending_heap = []         # (istante prossimo evento, seq, BaseOrder)
+        self._trash = []                # Ordini TOTRASH da rimuovere
+        self._free = []                 # Ordini rimossi, riusabili da new_order()
+        self._seq = itertools.count()   # Spareggio FIFO tra ordini con lo stesso istante
+
+    def new_order(self) -> BaseOrder:
+        """Ordine da inizializzare con init_order, riusato dalla free list se possibile"""
+        free = self._free
+        return free.pop() if free else BaseOrder()
+
+    def add(self, order: BaseOrder):
+        """Accoda un ordine appena inizializzato con init_order"""
+        self.orders[order.orderId] = order
+        self._schedule(order)
+
+    def restore(self, orders: list, time_now: int) -> int:
+        """
+        Ricarica in blocco gli ordini (ripartenza dell'Account Manager) e
+        ricostruisce l'heap.
+
+        Returns:
+            int: Ordini da processare al prossimo tick
+        """
+        for order in orders:
+            self.orders[order.orderId] = order
+        return self.resync(time_now)
+
+    def resync(self, time_now: int) -> int:
+        """
+        Ricostruisce l'heap dagli ordini in attesa, scartando le voci pigre
+        accumulate. Lo stato degli ordini viene copiato in colonne e il
+        kernel find_due calcola in un solo passaggio l'istante del prossimo
+        evento di ciascuno (subito per quelli già dovuti).
+
+        Returns:
+            int: Ordini da processare al prossimo tick
+        """
+        pending = [order for order in self.orders.values() if order.dealStatus in _PENDING]
+        n = len(pending)
+        status = np.fromiter((order.dealStatus for order in pending), np.int64, n)
+        deadline = np.fromiter((order.submitDeadline for order in pending), np.int64, n)
+        retry = np.fromiter((order.submitRetry for order in pending), np.int64, n)
+        event_time = np.empty(n, dtype=np.int64)
+        n_due = find_due(status, deadline, retry, time_now, event_time)
+
+        seq = self._seq
+        self._pending_heap = [(t, next(seq), order)
+                              for t, order in zip(event_time.tolist(), pending)]
+        heapq.heapify(self._pending_heap)
+        return n_due
+
+    def delay(self, order: BaseOrder, error_msg: str = "", time_now: int = 0):
+        """
+        Mette l'ordine in DELAYED e lo rimette nell'heap per il retry.
+        Senza time_now usa il timestamp dell'ultimo tick, nessuna lettura dell'orologio.
+        """
+        if order.set_delayed(time_now or self.time_now, error_msg):
+            self._schedule(order)
+
+    def trash(self, order: BaseOrder):
+        """Marca l'ordine come da eliminare"""
+        if order.transition(EV_TRASH):
+            self._trash.append(order)
+
+    def post_event(self, kind: OrderEventKind, order_id: int, payload: str = ""):
+        """Notifica l'esito di una richiesta al broker. Qualsiasi thread, non blocca."""
+        self.events.put(OrderEvent(kind, order_id, payload))
+
+    def _apply_events(self):
+        """Applica gli eventi del broker agli ordini. Solo thread Account Manager."""
+        orders = self.orders
+        for event in self.events.drain():
+            order = orders.get(event.orderId)
+            if order is None:
+                continue
+            kind = event.kind
+            if kind == OrderEventKind.SUBMITTED:
+                order.set_submitted(event.payload)
+            elif kind == OrderEventKind.DELAYED:
+                self.delay(order, event.payload, self.time_now)
+            elif kind == OrderEventKind.REJECTED:
+                order.set_rejected(event.payload)
+            elif kind == OrderEventKind.TOTRASH:
+                self.trash(order)
+
+    def _schedule(self, order: BaseOrder):
+        if order.dealStatus == DealStatus.DELAYED:
+            # Al pop o è il momento del retry o la deadline è scaduta
+            event_time = min(order.submitRetry, order.submitDeadline + 1)
+        else:
+            event_time = order.submitStart
+        heapq.heappush(self._pending_heap, (event_time, next(self._seq), order))
+
+    def process_order_list(self, time_now: int,
+                           do_async_request_orders_open,
+                           do_async_request_orders_close,
+                           do_async_request_orders_stop,
+                           _NOT=DealStatus.NOT_SUBMITTED.value,
+                           _DEL=DealStatus.DELAYED.value,
+                           _PENDING=_PENDING,
+                           _DISPATCH=_ACTION_DISPATCH,
+                           _EV_REJECT=EV_REJECT,
+                           _heappop=heapq.heappop) -> int:
+        """
+        Processa la coda di richiesta degli ordini con politica di submit e retry.
+
+        Questa è la logica reale estratta dal BaseAccountManager.
+        Gestisce timeout, retry ed eliminazione ordini completati.
+        Gli ordini dovuti nello stesso tick vengono raccolti per azione e
+        inviati con una sola chiamata per tipo: un solo round-trip verso il
+        broker per un ingresso su più ordini.
+
+        Args:
+            time_now: Timestamp corrente
+            do_async_request_orders_*: Callback per invio di una lista di ordini
+                (implementate dai broker specifici, vedi single_order_batch)
+
+        Returns:
+            int: Numero ordini eliminati dalla coda
+
+        I parametri con underscore legano enum e funzioni a nomi locali
+        (LOAD_FAST nel loop): non vanno passati dal chiamante.
+        """
+        self.time_now = time_now
+
+        # Prima gli esiti arrivati dal broker dall'ultimo tick
+        self._apply_events()
+
+        heap = self._pending_heap
+        batches = ([], [], [])
+
+        # Solo gli ordini dovuti, in ordine di istante
+        while heap and heap[0][0] <= time_now:
+            _, _, order = _heappop(heap)
+            deal_status = order.dealStatus
+            if deal_status not in _PENDING:
+                continue
+
             # Controllo timeout per submit
             if order.submitDeadline < time_now:
                 if order.errorMessage:
                     order.errorMessage += ". "
                 order.errorMessage += "Scaduto il tempo per il submit dell'ordine"
-                order.dealStatus = DealStatus.REJECTED
-                
+                order.transition(_EV_REJECT)
+
             # Invio ordine se è il momento giusto
-            if ((order.dealStatus == DealStatus.DELAYED and time_now >= order.submitRetry) or
-                    order.dealStatus == DealStatus.NOT_SUBMITTED):
-                
-                # Dispatch basato su tipo azione
-                if order.action == OrderAction.OPEN_POSITION:
-                    order.dealStatus = DealStatus.SUBMITTING
-                    do_async_request_order_open(order)
-                elif order.action == OrderAction.CLOSE_POSITION:
-                    order.dealStatus = DealStatus.SUBMITTING
-                    do_async_request_order_close(order)
-                elif order.action == OrderAction.MODIFY_POSITION:
-                    order.dealStatus = DealStatus.EXECUTING
-                    do_async_request_order_stop(order)
-                    
-        # Conteggio ordini da eliminare
-        if order.dealStatus == DealStatus.TOTRASH:
-            trashed_orders += 1
-            
-    # Cleanup della coda se troppi ordini terminati
-    if trashed_orders > 5:
-        order_list[:] = [order for order in order_list if order.dealStatus != DealStatus.TOTRASH]
-        
-    return trashed_orders
+            elif deal_status == _NOT or (deal_status == _DEL and time_now >= order.submitRetry):
+                route = _DISPATCH.get(order.action)
+                if route is None:
+                    # Azione sconosciuta: rifiuto il solo ordine, gli altri
+                    # del lotto partono comunque
+                    order.errorMessage = f"ERRORE azione {order.action} non gestita"
+                    order.transition(_EV_REJECT)
+                    continue
+                order.transition(route[0])
+                batches[route[1]].append(order)
+
+        opens, closes, stops = batches
+        if opens:
+            do_async_request_orders_open(opens)
+        if closes:
+            do_async_request_orders_close(closes)
+        if stops:
+            do_async_request_orders_stop(stops)
+
+        # Cleanup della coda se troppi ordini terminati
+        trashed_orders = len(self._trash)
+        if trashed_orders > 5:
+            orders = self.orders
+            for order in self._trash:
+                if orders.get(order.orderId) is order:
+                    del orders[order.orderId]
+            self._free.extend(self._trash)
+            self._trash.clear()
+
+        return trashed_orders
+
+
+# ============================================================================
+# LOG DIAGNOSTICO - Messaggi fuori dal thread del TradeMgr
+# ============================================================================
+
+# Codici dei messaggi diagnostici e relativi template
+LOG_ORDER_ERROR = 0
+LOG_ORDER_ACCEPTED = 1
+LOG_FILL_ERROR = 2
+LOG_ORDER_FILLED = 3
+LOG_DB_ERROR = 4
+LOG_CALLBACK_ERROR = 5
+LOG_WRITE_DROPPED = 6
+
+_LOG_TEMPLATES = (
+    "ERRORE Ordine id: {}",
+    "Ordine id: {} ACCETTATO",
+    "ERRORE Esecuzione ordine id: {}",
+    "Ordine id: {} ESEGUITO @ {}",
+    "Errore database: {}",
+    "ERRORE callback ordine id: {}: {}",
+    "ERRORE scrittura ordine id: {} scartata dopo {} tentativi",
+)
+
+
+class RingLogger:
+    """
+    Logger diagnostico a ring buffer.
+
+    log() accoda solo la tupla (codice, argomenti): nessuna formattazione,
+    nessun lock di I/O sul thread chiamante. Un thread writer ogni
+    interval secondi preleva i record, li formatta con _LOG_TEMPLATES e li
+    scrive con una sola write sul file descriptor. Se il writer resta
+    indietro di capacity record i più vecchi vengono scartati.
+    """
+
+    def __init__(self, capacity: int = 65536, fd: int = None, interval: float = 0.05):
+        self._records = deque(maxlen=capacity)
+        self._fd = sys.stdout.fileno() if fd is None else fd
+        self._interval = interval
+        self._lock = threading.Lock()   # Solo tra writer e flush(), mai su log()
+        self._thread = threading.Thread(target=self._writer, name="RingLogger", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def log(self, code: int, *args):
+        """Accoda un messaggio. Qualsiasi thread, non blocca."""
+        self._records.append((code, args))
+
+    def flush(self):
+        """Formatta e scrive i record accodati"""
+        records = self._records
+        with self._lock:
+            lines = []
+            try:
+                while True:
+                    code, args = records.popleft()
+                    lines.append(_LOG_TEMPLATES[code].format(*args) + "\n")
+            except IndexError:
+                pass
+            if lines:
+                data = memoryview("".join(lines).encode())
+                while data:
+                    data = data[os.write(self._fd, data):]
+
+    def _writer(self):
+        while True:
+            time.sleep(self._interval)
+            if self._records:
+                self.flush()
+
+
+# Istanza creata al primo messaggio (thread, atexit e fd di stdout non
+# vengono toccati all'import) oppure iniettata con set_ring_logger()
+_LOG = None
+_LOG_INIT_LOCK = threading.Lock()
+
+
+def get_ring_logger() -> RingLogger:
+    """RingLogger del modulo, creato alla prima chiamata"""
+    global _LOG
+    if _LOG is None:
+        with _LOG_INIT_LOCK:
+            if _LOG is None:
+                _LOG = RingLogger()
+    return _LOG
+
+
+def set_ring_logger(logger: RingLogger) -> None:
+    """Inietta il RingLogger da usare (es. su un fd dedicato o nei test)"""
+    global _LOG
+    _LOG = logger
+
+
+# ============================================================================
+# DAO ASINCRONO - Scritture ordini fuori dal thread del TradeMgr
+# ============================================================================
+
+def encode_payload(payload: dict) -> bytes:
+    """Codifica JSON compatta di un payload DAO, con orjson se disponibile"""
+    if HAS_ORJSON:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+class AsyncDao:
+    """
+    Wrapper del DAO che rende asincroni gli aggiornamenti degli ordini.
+
+    Stesso modello submission/completion queue di io_uring: i callback
+    accodano la scrittura e ritornano subito, un thread writer la esegue
+    sul DAO reale a lotti, l'esito va nella coda completamenti. Il loop del
+    TradeMgr chiama reap() ad ogni iterazione e marca gli ordini come
+    persistiti, senza mai attendere il database.
+
+    Un solo writer in ordine FIFO: gli aggiornamenti dello stesso ordine
+    arrivano al database nell'ordine in cui sono stati accodati.
+
+    I payload arrivano già codificati in JSON (encode_payload): il DAO reale
+    li scrive così come sono nella colonna JSONB con query parametrizzata.
+
+    Le scritture fallite non vanno perse: il writer le tiene in _held,
+    insieme a tutte le scritture successive dello stesso ordine, e le
+    ritenta in ordine quando reap() lo risveglia dopo un fallimento, fino a
+    max_retries tentativi. Un payload vecchio non sovrascrive mai uno più
+    recente dello stesso ordine. persisted diventa True solo quando l'ordine
+    non ha più scritture in sospeso.
+    """
+
+    def __init__(self, dao, batch_size: int = 64, max_retries: int = 3):
+        self._dao = dao
+        self._batch_size = batch_size
+        self._max_retries = max_retries
+        self._submit = deque()      # (metodo DAO, payload, trade_order, tentativi)
+        self._complete = deque()    # (scrittura, errore o None, conclusa)
+        self._held = {}             # id ordine -> scritture in attesa di retry (solo writer)
+        self._outstanding = {}      # id ordine -> scritture non concluse (solo TradeMgr)
+        self._wakeup = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._writer, name="AsyncDao", daemon=True)
+        self._thread.start()
+
+    def update_order_status_bytes(self, payload: bytes, trade_order: TradeOrder = None):
+        self._post('update_order_status_bytes', payload, trade_order)
+
+    def update_order_error_bytes(self, payload: bytes, trade_order: TradeOrder = None):
+        self._post('update_order_error_bytes', payload, trade_order)
+
+    def update_order_filled_bytes(self, payload: bytes, trade_order: TradeOrder = None):
+        self._post('update_order_filled_bytes', payload, trade_order)
+
+    def _post(self, method: str, payload: bytes, trade_order: Optional[TradeOrder]):
+        """Accoda la scrittura e sveglia il writer. Non blocca mai."""
+        if trade_order is not None:
+            trade_order.persisted = False
+            outstanding = self._outstanding
+            outstanding[trade_order.id] = outstanding.get(trade_order.id, 0) + 1
+        self._submit.append((method, payload, trade_order, 0))
+        self._wakeup.set()
+
+    def _writer(self):
+        """Thread writer: prima i retry, poi le scritture accodate a lotti di batch_size"""
+        submit = self._submit
+        held = self._held
+        while self._running or submit or held:
+            # In chiusura niente attesa: i retry rimasti si esauriscono in max_retries giri
+            if self._running:
+                self._wakeup.wait()
+                self._wakeup.clear()
+            for key in list(held):
+                self._retry_held(key)
+            while submit:
+                batch = [submit.popleft() for _ in range(min(self._batch_size, len(submit)))]
+                for write in batch:
+                    key = write[2].id if write[2] is not None else None
+                    pending = held.get(key)
+                    if pending is not None:
+                        # Dietro la scrittura fallita dello stesso ordine
+                        pending.append(write)
+                        continue
+                    retry = self._execute(write)
+                    if retry is not None:
+                        held[key] = deque((retry,))
+
+    def _retry_held(self, key):
+        """Ritenta in ordine le scritture trattenute di un ordine, fermandosi al primo fallimento"""
+        pending = self._held[key]
+        while pending:
+            retry = self._execute(pending[0])
+            if retry is not None:
+                pending[0] = retry
+                return
+            pending.popleft()
+        del self._held[key]
+
+    def _execute(self, write: tuple) -> Optional[tuple]:
+        """
+        Esegue una scrittura sul DAO e ne accoda l'esito.
+
+        Returns:
+            La scrittura da ritentare (tentativi + 1), None se conclusa
+            (riuscita o scartata dopo max_retries tentativi)
+        """
+        method, payload, trade_order, attempts = write
+        try:
+            getattr(self._dao, method)(payload)
+        except Exception as e:
+            attempts += 1
+            if attempts < self._max_retries:
+                self._complete.append((write, e, False))
+                return method, payload, trade_order, attempts
+            self._complete.append((write, e, True))
+            return None
+        self._complete.append((write, None, True))
+        return None
+
+    def reap(self) -> int:
+        """
+        Preleva i completamenti e aggiorna il flag persisted degli ordini.
+        Dopo un fallimento risveglia il writer per i retry.
+        Da chiamare dal loop del TradeMgr.
+
+        Returns:
+            int: Numero scritture fallite
+        """
+        failed = 0
+        complete = self._complete
+        outstanding = self._outstanding
+        while complete:
+            write, error, done = complete.popleft()
+            trade_order = write[2]
+            if error is not None:
+                failed += 1
+                get_ring_logger().log(LOG_DB_ERROR, error)
+                if done:
+                    get_ring_logger().log(LOG_WRITE_DROPPED, trade_order.id if trade_order else 0,
+                                          write[3] + 1)
+            if trade_order is not None and done:
+                left = outstanding[trade_order.id] - 1
+                if left:
+                    outstanding[trade_order.id] = left
+                else:
+                    del outstanding[trade_order.id]
+                trade_order.persisted = not left and error is None
+
+        if failed:
+            self._wakeup.set()
+        return failed
+
+    def close(self):
+        """Completa le scritture pendenti e ferma il writer"""
+        self._running = False
+        self._wakeup.set()
+        self._thread.join()
+
+
+# ============================================================================
+# ORDER BOOK - Stato degli ordini del TradeMgr a colonne
+# ============================================================================
+
+class OrderBook:
+    """
+    Stato di esecuzione degli ordini del TradeMgr in array paralleli (SoA).
+
+    Una riga per ordine, indicizzata da id_to_row: le aggregazioni di
+    portafoglio (P&L realizzato, ordini eseguiti) sono operazioni
+    vettoriali NumPy invece di un giro su tutti i TradeOrder.
+    I TradeOrder restano il record per ordine verso DAO e BaseSystem.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.id_to_row = {}
+        self.count = 0
+        self.exec_state = np.zeros(capacity, dtype=np.int8)
+        self.avg_fill_price = np.zeros(capacity, dtype=np.float64)
+        self.pnl = np.zeros(capacity, dtype=np.float64)
+        self.filled = np.zeros(capacity, dtype=np.float64)
+
+    def row(self, order_id: int) -> int:
+        """Riga dell'ordine, allocata al primo accesso"""
+        row = self.id_to_row.get(order_id)
+        if row is None:
+            row = self.count
+            if row == self.exec_state.shape[0]:
+                self._grow()
+            self.id_to_row[order_id] = row
+            self.count = row + 1
+        return row
+
+    def _grow(self):
+        """Raddoppia la capacità delle colonne"""
+        size = self.exec_state.shape[0] * 2
+        for name in ('exec_state', 'avg_fill_price', 'pnl', 'filled'):
+            column = getattr(self, name)
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[:column.shape[0]] = column
+            setattr(self, name, grown)
+
+    def realized_pnl(self) -> float:
+        """P&L complessivo degli ordini eseguiti"""
+        n = self.count
+        return float(self.pnl[:n][self.exec_state[:n] == OrderExecState.FILLED].sum())
+
+    def filled_count(self) -> int:
+        """Numero di ordini eseguiti"""
+        return int(np.count_nonzero(self.exec_state[:self.count] == OrderExecState.FILLED))
 
 
 # ============================================================================
 # ORDER CALLBACKS - Come gestisco le risposte dal TradeMgr
 # ============================================================================
 
+# Pool di dict payload per il DAO. Il payload viene codificato in bytes
+# prima di passarlo al DAO, quindi il dict torna nel pool subito dopo:
+# a regime i callback non allocano dict. Le chiavi sono già presenti
+# nell'ordine del JSON; pop/append su lista sono atomici tra thread.
+_PAYLOAD_POOL_SIZE = 256
+_ERROR_PAYLOADS = [dict(status=0, errorMessage='', errorCode=0, id=0)
+                   for _ in range(_PAYLOAD_POOL_SIZE)]
+_STATUS_PAYLOADS = [dict(status=0, dealId='', id=0) for _ in range(_PAYLOAD_POOL_SIZE)]
+_FILLED_PAYLOADS = [dict(avgFillPrice=0.0, pnl=0.0, id=0) for _ in range(_PAYLOAD_POOL_SIZE)]
+
+
+def _encode_error_payload(status: int, error_message: str, error_code: int, order_id: int) -> bytes:
+    payload = _ERROR_PAYLOADS.pop() if _ERROR_PAYLOADS else dict(status=0, errorMessage='', errorCode=0, id=0)
+    payload['status'] = status
+    payload['errorMessage'] = error_message
+    payload['errorCode'] = error_code
+    payload['id'] = order_id
+    data = encode_payload(payload)
+    _ERROR_PAYLOADS.append(payload)
+    return data
+
+
+def _encode_status_payload(status: int, deal_id: str, order_id: int) -> bytes:
+    payload = _STATUS_PAYLOADS.pop() if _STATUS_PAYLOADS else dict(status=0, dealId='', id=0)
+    payload['status'] = status
+    payload['dealId'] = deal_id
+    payload['id'] = order_id
+    data = encode_payload(payload)
+    _STATUS_PAYLOADS.append(payload)
+    return data
+
+
+def _encode_filled_payload(avg_fill_price: float, pnl: float, order_id: int) -> bytes:
+    payload = _FILLED_PAYLOADS.pop() if _FILLED_PAYLOADS else dict(avgFillPrice=0.0, pnl=0.0, id=0)
+    payload['avgFillPrice'] = avg_fill_price
+    payload['pnl'] = pnl
+    payload['id'] = order_id
+    data = encode_payload(payload)
+    _FILLED_PAYLOADS.append(payload)
+    return data
+
+
 def on_order_result_handler(srv_code: int, order_response: dict, 
-                           trade_order: dict, dao) -> bool:
+                           trade_order: TradeOrder, dao,
+                           book: Optional[OrderBook] = None) -> bool:
     """
     Gestisce la risposta del broker per un ordine inviato.
     
@@ -313,53 +1004,61 @@ def on_order_result_handler(srv_code: int, order_response: dict,
         srv_code: Codice risposta (0=OK, altro=errore)
         order_response: Risposta dal broker
         trade_order: Ordine da aggiornare
-        dao: Data Access Object per database
+        dao: Data Access Object per database (AsyncDao: la scrittura non blocca)
+        book: OrderBook del TradeMgr da aggiornare (opzionale)
         
     Returns:
         bool: True se processing OK, False se errore
     """
-    # Gestione errore invio
-    if srv_code:
-        print(f"ERRORE Ordine id: {order_response['orderId']}")
-        
-        # Aggiorno stato ordine
-        trade_order['status']['execState'] = OrderExecState.ERROR
-        trade_order['status']['errorCode'] = 1
-        trade_order['status']['errorMessage'] = order_response.get('message', 'Errore sconosciuto')
-        
-        # Salvataggio su database
-        try:
-            dao.update_order_error({
-                'status': trade_order['status']['execState'].value,
-                'errorMessage': trade_order['status']['errorMessage'],
-                'errorCode': trade_order['status']['errorCode'],
-                'id': trade_order['id']
-            })
-        except Exception as e:
-            print(f"Errore database: {e}")
-            
-        return False
-        
-    # Gestione successo
-    trade_order['status']['execState'] = OrderExecState.ACCEPTED
-    trade_order['status']['dealReference'] = order_response['dealReference']
-    
-    # Aggiorno database
     try:
-        dao.update_order_status({
-            'status': trade_order['status']['execState'].value,
-            'dealId': trade_order['status']['dealReference'],
-            'id': trade_order['id']
-        })
+        # Gestione errore invio
+        if srv_code:
+            get_ring_logger().log(LOG_ORDER_ERROR, order_response['orderId'])
+
+            # Aggiorno stato ordine
+            exec_state = OrderExecState.ERROR
+            exec_state_val = exec_state.value
+            error_message = order_response.get('message', 'Errore sconosciuto')
+            trade_order.execState = exec_state
+            trade_order.errorCode = 1
+            trade_order.errorMessage = error_message
+            if book is not None:
+                row = book.row(trade_order.id)
+                book.exec_state[row] = exec_state_val
+
+            # Salvataggio su database
+            dao.update_order_error_bytes(
+                _encode_error_payload(exec_state_val, error_message, 1, trade_order.id),
+                trade_order)
+
+            return False
+
+        # Gestione successo
+        exec_state = OrderExecState.ACCEPTED
+        exec_state_val = exec_state.value
+        deal_reference = order_response['dealReference']
+        trade_order.execState = exec_state
+        trade_order.dealReference = deal_reference
+        if book is not None:
+            row = book.row(trade_order.id)
+            book.exec_state[row] = exec_state_val
+
+        # Aggiorno database
+        dao.update_order_status_bytes(
+            _encode_status_payload(exec_state_val, deal_reference, trade_order.id),
+            trade_order)
+
+        get_ring_logger().log(LOG_ORDER_ACCEPTED, order_response['orderId'])
+        return True
     except Exception as e:
-        print(f"Errore database: {e}")
-        
-    print(f"Ordine id: {order_response['orderId']} ACCETTATO")
-    return True
+        trade_order.persisted = False
+        get_ring_logger().log(LOG_CALLBACK_ERROR, trade_order.id, e)
+        return False
 
 
 def on_order_filled_handler(srv_code: int, order_filled: dict,
-                           trade_order: dict, dao) -> bool:
+                           trade_order: TradeOrder, dao,
+                           book: Optional[OrderBook] = None) -> bool:
     """
     Gestisce l'evento di ordine eseguito (filled).
     
@@ -370,49 +1069,59 @@ def on_order_filled_handler(srv_code: int, order_filled: dict,
         srv_code: Codice risposta
         order_filled: Dati esecuzione ordine
         trade_order: Ordine eseguito
-        dao: Data Access Object
+        dao: Data Access Object (AsyncDao: la scrittura non blocca)
+        book: OrderBook del TradeMgr da aggiornare (opzionale)
         
     Returns:
         bool: True se processing OK, False se errore
     """
-    # Gestione errore esecuzione
-    if srv_code:
-        print(f"ERRORE Esecuzione ordine id: {order_filled['orderId']}")
-        
-        trade_order['status']['execState'] = OrderExecState.ERROR
-        trade_order['status']['errorCode'] = 2
-        trade_order['status']['errorMessage'] = order_filled.get('message', 'Errore esecuzione')
-        
-        try:
-            dao.update_order_error({
-                'status': trade_order['status']['execState'].value,
-                'errorMessage': trade_order['status']['errorMessage'], 
-                'errorCode': trade_order['status']['errorCode'],
-                'id': trade_order['id']
-            })
-        except Exception as e:
-            print(f"Errore database: {e}")
-            
-        return False
-        
-    # Aggiorno con dati esecuzione
-    trade_order['status']['execState'] = OrderExecState.FILLED
-    trade_order['status']['avgFillPrice'] = order_filled['price']
-    trade_order['status']['pnl'] = order_filled['pnl']
-    trade_order['status']['filled'] = order_filled['qty']
-    
-    # Salvataggio risultati esecuzione
     try:
-        dao.update_order_filled({
-            'avgFillPrice': order_filled['price'],
-            'pnl': order_filled['pnl'],
-            'id': order_filled['orderId']
-        })
+        # Gestione errore esecuzione
+        if srv_code:
+            get_ring_logger().log(LOG_FILL_ERROR, order_filled['orderId'])
+
+            exec_state = OrderExecState.ERROR
+            exec_state_val = exec_state.value
+            error_message = order_filled.get('message', 'Errore esecuzione')
+            trade_order.execState = exec_state
+            trade_order.errorCode = 2
+            trade_order.errorMessage = error_message
+            if book is not None:
+                row = book.row(trade_order.id)
+                book.exec_state[row] = exec_state_val
+
+            dao.update_order_error_bytes(
+                _encode_error_payload(exec_state_val, error_message, 2, trade_order.id),
+                trade_order)
+
+            return False
+
+        # Aggiorno con dati esecuzione
+        price = order_filled['price']
+        pnl = order_filled['pnl']
+        qty = order_filled['qty']
+        trade_order.execState = OrderExecState.FILLED
+        trade_order.avgFillPrice = price
+        trade_order.pnl = pnl
+        trade_order.filled = qty
+        if book is not None:
+            row = book.row(trade_order.id)
+            book.exec_state[row] = OrderExecState.FILLED.value
+            book.avg_fill_price[row] = price
+            book.pnl[row] = pnl
+            book.filled[row] = qty
+
+        # Salvataggio risultati esecuzione
+        dao.update_order_filled_bytes(
+            _encode_filled_payload(price, pnl, order_filled['orderId']),
+            trade_order)
+
+        get_ring_logger().log(LOG_ORDER_FILLED, order_filled['orderId'], price)
+        return True
     except Exception as e:
-        print(f"Errore database: {e}")
-        
-    print(f"Ordine id: {order_filled['orderId']} ESEGUITO @ {order_filled['price']}")
-    return True
+        trade_order.persisted = False
+        get_ring_logger().log(LOG_CALLBACK_ERROR, trade_order.id, e)
+        return False
 
 
 # ============================================================================
@@ -437,7 +1146,7 @@ if __name__ == "__main__":
         submit_time_delay_sec=30
     )
     
-    print(f"Ordine creato: {order_data['epic']} - Stato: {order_data['status']['execState']}")
+    print(f"Ordine creato: {order_data.epic} - Stato: {order_data.execState}")
     
     # 2. Creazione BaseOrder per Account Manager
     base_order = BaseOrder()
@@ -458,17 +1167,18 @@ if __name__ == "__main__":
     else:
         print(f"Errore validazione: {base_order.errorMessage}")
         
-    # 4. Simulazione stati ordine
+    # 4. Simulazione stati ordine: invio al broker e conferma
+    base_order.transition(EV_SEND)
     base_order.set_submitted("DEAL_REF_12345")
     print(f"Ordine inviato - Deal Reference: {base_order.dealReference}")
     
     # 5. Aggiornamento stato finale
-    order_data['status']['execState'] = OrderExecState.FILLED
-    order_data['status']['avgFillPrice'] = 1.0895
-    order_data['status']['filled'] = 1000
-    order_data['status']['pnl'] = 45.0
+    order_data.execState = OrderExecState.FILLED
+    order_data.avgFillPrice = 1.0895
+    order_data.filled = 1000
+    order_data.pnl = 45.0
     
-    print(f"Ordine eseguito @ {order_data['status']['avgFillPrice']} - P&L: {order_data['status']['pnl']}")
+    print(f"Ordine eseguito @ {order_data.avgFillPrice} - P&L: {order_data.pnl}")
     
     print("\n=== LIFECYCLE COMPLETO ===")
     print("JUST_CREATED -> SUBMITTED -> ACCEPTED -> FILLED")
@@ -9,10 +9,205 @@ Questo NON è codice eseguibile, ma una vetrina dell'architettura implementata.
 
 from abc import ABC, abstractmethod
 import json
+import os
 from typing import Dict, Any, List
 from mtcommon.utils.ChartData import ChartData
 from maotrade.mtlogging import Severity
 
+# orjson opzionale: encoder C molto più veloce di json per lo stato dei systems
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _encode_json(value) -> bytes:
+    """
+    Serializza un valore JSON compatto, con orjson se disponibile.
+
+    NaN e infinito: orjson li scrive come null (JSON valido), json come
+    NaN/Infinity. Lo stato riletto con orjson riporta quindi None al posto
+    di NaN: i systems che salvano indicatori non ancora calcolati devono
+    trattare None come "valore assente".
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(value, default=str,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, separators=(',', ':'), default=str).encode()
+
+
+class StateProxy(dict):
+    """
+    Stato del system che tiene traccia delle chiavi modificate.
+
+    Ogni chiave ha un bit in _dirty_mask e un frammento JSON ('"chiave":valore')
+    in cache: to_json() riserializza solo le chiavi modificate e ricompone il
+    documento dai frammenti. Aggiunte/rimozioni di chiavi forzano la
+    riserializzazione completa.
+
+    Le modifiche annidate (state['a']['b'] = x) non passano da __setitem__:
+    riassegnare la chiave o chiamare mark_dirty('a').
+
+    copy(), | e pickle restituiscono un nuovo StateProxy con cache vuota.
+    """
+
+    __slots__ = ('_index', '_fragments', '_dirty_mask', '_structural')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._index = {}
+        self._fragments = []
+        self._dirty_mask = 0
+        self._structural = True
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.mark_dirty(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._structural = True
+
+    def mark_dirty(self, key):
+        """Segna la chiave da riserializzare"""
+        idx = self._index.get(key)
+        if idx is None:
+            self._structural = True
+        else:
+            self._dirty_mask |= 1 << idx
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._structural = True
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._structural = True
+        return self
+
+    def __or__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        proxy = StateProxy(self)
+        dict.update(proxy, other)
+        return proxy
+
+    def __ror__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        proxy = StateProxy(other)
+        dict.update(proxy, self)
+        return proxy
+
+    def copy(self):
+        return StateProxy(self)
+
+    def __reduce__(self):
+        # Il pickle di default ripristina le chiavi con __setitem__ prima
+        # degli slot: ricostruisco dal contenuto, la cache si rigenera
+        return StateProxy, (dict(self),)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._structural = True
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._structural = True
+        return super().pop(*args)
+
+    def popitem(self):
+        self._structural = True
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self._structural = True
+
+    def to_json(self) -> bytes:
+        """Documento JSON dello stato, riserializzando solo le chiavi modificate"""
+        if self._structural:
+            self._index = {key: i for i, key in enumerate(self)}
+            self._fragments = [self._fragment(key, value) for key, value in self.items()]
+            self._structural = False
+        elif self._dirty_mask:
+            mask = self._dirty_mask
+            fragments = self._fragments
+            for key, idx in self._index.items():
+                if mask >> idx & 1:
+                    fragments[idx] = self._fragment(key, dict.__getitem__(self, key))
+        self._dirty_mask = 0
+        return b'{' + b','.join(self._fragments) + b'}'
+
+    @staticmethod
+    def _fragment(key, value) -> bytes:
+        return _encode_json(key if isinstance(key, str) else str(key)) + b':' + _encode_json(value)
+
+
+def _writev_all(fd: int, buffers: list) -> int:
+    """Scrive tutti i buffer con writev, riprendendo dopo le scritture parziali"""
+    if not hasattr(os, 'writev'):
+        data = b''.join(buffers)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        return len(data)
+    total = 0
+    while buffers:
+        written = os.writev(fd, buffers)
+        total += written
+        # Scarto i buffer scritti per intero, l'eventuale parziale riparte dal resto
+        i = 0
+        while i < len(buffers) and written >= len(buffers[i]):
+            written -= len(buffers[i])
+            i += 1
+        buffers = buffers[i:]
+        if buffers and written:
+            buffers[0] = memoryview(buffers[0])[written:]
+    return total
+
+
+class StateFlusher:
+    """
+    Raccoglie i blob di stato dei systems e li scrive su disco a lotti.
+
+    Ogni system accoda il proprio stato (flush_state) invece di scriverlo
+    subito; flush() viene chiamato una volta per tick, o prima se i buffer
+    accodati arrivano a max_iovec, e fa un solo os.writev per file
+    descriptor con tutti i buffer di quel file.
+    """
+
+    def __init__(self, max_iovec: int = 64):
+        self._pending = {}      # fd -> lista di bytes da scrivere
+        self._count = 0
+        self._max_iovec = max_iovec
+
+    def enqueue(self, fd: int, data: bytes):
+        """Accoda un blob da scrivere su fd"""
+        buffers = self._pending.get(fd)
+        if buffers is None:
+            self._pending[fd] = [data]
+        else:
+            buffers.append(data)
+        self._count += 1
+        if self._count >= self._max_iovec:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Scrive tutti i blob accodati.
+
+        Returns:
+            int: Byte scritti
+        """
+        written = 0
+        for fd, buffers in self._pending.items():
+            written += _writev_all(fd, buffers)
+        self._pending.clear()
+        self._count = 0
+        return written
+
 
 class BaseSystem(ABC):
     """
@@ -22,17 +217,16 @@ class BaseSystem(ABC):
     
     def __init__(self, config_params: dict, system_params: dict):
         # State interno - tutto qui viene automaticamente persistito
-        self._state = {}
         self._state_updated = False
         
         # Parametri del sistema sempre presenti
-        self._state = {
+        self._state = StateProxy({
             'systemCompleted': system_params.get('systemCompleted', False),
             'systemBlocked': system_params.get('systemBlocked', False), 
             'systemError': system_params.get('systemError', False),
             'frameMissUpdateSec': system_params.get('frameMissUpdateSec', 60),
             'maxOrderSubmitTimeSec': system_params.get('maxOrderSubmitTimeSec', 30)
-        }
+        })
         
         # Chart data per visualizzazione grafica
         self._chart = None
@@ -47,16 +241,29 @@ class BaseSystem(ABC):
         return self._state
 
     @property 
-    def system_state_json(self) -> str:
+    def system_state_json(self) -> bytes:
         """
         Ritorna la struttura che contiene lo stato del system in formato JSON 
-        solo se lo stato è stato aggiornato dall'ultima richiesta.
+        (bytes UTF-8) solo se lo stato è stato aggiornato dall'ultima richiesta.
         Meccanismo per evitare salvataggi inutili su disco.
+
+        Vengono riserializzate solo le chiavi modificate (vedi StateProxy).
         """
         if not self._state_updated:
-            return ""
+            return b""
         self._state_updated = False
-        return json.dumps(self._state, separators=(',', ':'), default=str)
+        return self._state.to_json()
+
+    def flush_state(self, flusher: StateFlusher, fd: int) -> bool:
+        """
+        Accoda lo stato, se aggiornato, come riga JSON sul file del system.
+        La scrittura vera avviene al flush() del StateFlusher.
+        """
+        data = self.system_state_json
+        if not data:
+            return False
+        flusher.enqueue(fd, data + b'\n')
+        return True
 
     def update_chart_state_log(self, chart: ChartData, state: dict, log: list):
         """
@@ -69,7 +276,7 @@ class BaseSystem(ABC):
             self._chart = chart
             self._chart_updated = True
         if state:
-            self._state = state
+            self._state = StateProxy(state)
             self._state_updated = True
         if log:
             self.__system_log.restore_log_items(log)
@@ -279,6 +486,7 @@ ARCHITETTURA EVIDENZIATA (dal codice reale):
 1. STATE PERSISTENCE: 
    - system_state_json() salva automaticamente ogni modifica
    - _state_updated flag evita salvataggi inutili
+   - StateFlusher scrive gli stati di tutti i systems con un writev per file
    
 2. RECOVERY FRAMEWORK:
    - request_resume_system() entry point standardizzato